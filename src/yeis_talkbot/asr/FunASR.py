@@ -6,16 +6,14 @@ import torch
 import numpy.typing as npt
 from funasr import AutoModel  # type: ignore
 
-from ..configs import AppConfig
+from ..configs import AppConfig, DEFAULT_STREAMING_CHUNK_SIZE
 from ..types import audio_type
 from .abc import ASR
 from ..event import BaseEvent, event_bus, ASREvent, ASRHandler
+from ..utils.profiling import profiler
 
 logger = logging.getLogger(__name__)
 
-# 默认流式参数
-DEFAULT_STREAMING_CHUNK_SIZE = [0, 10, 5]
-
 
 class FunASR(ASR):
     """
@@ -28,12 +26,14 @@ class FunASR(ASR):
     3. 在音频流结束时，调用 `transcribe(last_chunk, is_final=True)` 来获取最后的结果。
     """
 
-    def __init__(self, app_config: AppConfig) -> None:
+    def __init__(self, app_config: AppConfig, model: Any = None) -> None:
         """
         初始化流式ASR模型和配置。
 
         Args:
             app_config (AppConfig): 包含模型路径和参数的应用程序配置。
+            model (Any): 已加载的模型，接口与 `AutoModel.generate` 相同；
+                不指定时按配置加载 AutoModel。
         """
         logger.info("Initializing FunASR streaming model...")
 
@@ -49,6 +49,10 @@ class FunASR(ASR):
 
         self.cache: Dict[str, Any] = {}
 
+        if model is not None:
+            self.model = model
+            return
+
         try:
             device = "cuda:0" if torch.cuda.is_available() else "cpu"
             self.model = AutoModel(
@@ -67,7 +71,8 @@ class FunASR(ASR):
         内部辅助函数，将输入的Numpy音频块归一化为np.float32格式。
         """
         if chunk.dtype == np.float32:
-            return chunk.astype(np.float32)
+            # 已经是 ASR 需要的格式（例如 Resampler 的输出），不再拷贝
+            return np.asarray(chunk, dtype=np.float32)
         if chunk.dtype == np.int16:
             # 将16-bit整数归一化到float32
             return chunk.astype(np.float32) / 32768.0
@@ -84,9 +89,18 @@ class FunASR(ASR):
         logger.debug("Resetting ASR streaming cache.")
         self.cache = {}
 
-    def transcribe(self, chunk: Optional[audio_type], is_final: bool = False) -> str:
+    def transcribe(
+        self,
+        chunk: Optional[audio_type],
+        is_final: bool = False,
+        chunk_size: Optional[List[int]] = None,
+    ) -> str:
         """
         对单个Numpy音频块（chunk）进行流式转录。
+
+        Args:
+            chunk_size (List[int]): 本次调用使用的流式参数，例如会话级别的配置覆盖，
+                不指定时使用配置文件中的 chunk_size。
         """
         if chunk is None:
             if not is_final:
@@ -94,19 +108,21 @@ class FunASR(ASR):
             normalized_chunk = np.zeros(0, dtype=np.float32)
         else:
             try:
-                normalized_chunk = self._normalize_chunk(chunk)
+                with profiler.stage("asr.normalize"):
+                    normalized_chunk = self._normalize_chunk(chunk)
             except TypeError as e:
                 logger.error(e)
                 return ""
 
         try:
-            res: List[Dict[str, Any]] = self.model.generate(  # type: ignore
-                input=normalized_chunk,
-                cache=self.cache,
-                is_final=is_final,
-                chunk_size=self.chunk_size,
-                use_itn=True,
-            )
+            with profiler.stage("asr.generate"):
+                res: List[Dict[str, Any]] = self.model.generate(  # type: ignore
+                    input=normalized_chunk,
+                    cache=self.cache,
+                    is_final=is_final,
+                    chunk_size=chunk_size or self.chunk_size,
+                    use_itn=True,
+                )
             return res[0].get("text", "") if res else ""  # type: ignore
         except Exception as e:
             logger.error(
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional
 from ..types import audio_type
 
 
@@ -11,12 +11,19 @@ class ASR(ABC):
     """
 
     @abstractmethod
-    def transcribe(self, chunk: Optional[audio_type], is_final: bool = False) -> str:
+    def transcribe(
+        self,
+        chunk: Optional[audio_type],
+        is_final: bool = False,
+        chunk_size: Optional[List[int]] = None,
+    ) -> str:
         """
         Transcribe audio input to text.
 
         :param chunk: Audio input to be transcribed.
         :param is_final: Whether this is the final chunk of audio.
+        :param chunk_size: Streaming chunk size for this call, e.g. from a
+            per-session config; defaults to the configured chunk size.
         :return: Transcribed text.
         """
         pass
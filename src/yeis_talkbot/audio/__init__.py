@@ -0,0 +1,21 @@
+from .ring_buffer import RingBuffer
+from .resample import Resampler, polyphase_filter, to_mono_float
+from .capture import (
+    AudioCapture,
+    AudioSource,
+    FakeAudioSource,
+    PyAudioSource,
+    frame_size_from_chunk_size,
+)
+
+__all__ = [
+    "RingBuffer",
+    "Resampler",
+    "polyphase_filter",
+    "to_mono_float",
+    "AudioCapture",
+    "AudioSource",
+    "FakeAudioSource",
+    "PyAudioSource",
+    "frame_size_from_chunk_size",
+]
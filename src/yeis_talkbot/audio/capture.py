@@ -0,0 +1,240 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, List, Optional, Protocol
+
+import numpy as np
+import numpy.typing as npt
+
+from .ring_buffer import RingBuffer
+
+logger = logging.getLogger(__name__)
+
+AudioCallback = Callable[[Optional[npt.NDArray[Any]]], None]
+"""音频回调，参数为一块采样点，None 表示音频源已结束"""
+
+# FunASR 流式模型的 chunk_size[1] 以 60ms 为单位，16kHz 下为 960 个采样点
+SAMPLES_PER_CHUNK_UNIT = 960
+
+
+def frame_size_from_chunk_size(chunk_size: List[int], sample_rate: int = 16000) -> int:
+    """
+    根据 FunASR 的 chunk_size 计算每帧的采样点数
+
+    例如 [0, 10, 5] 在 16kHz 下为 10 * 960 = 9600 个采样点（600ms）。
+    """
+    return int(chunk_size[1]) * SAMPLES_PER_CHUNK_UNIT * sample_rate // 16000
+
+
+class AudioSource(Protocol):
+    """音频源，在自己的线程中通过回调推送采样点"""
+
+    sample_rate: int
+
+    def start(self, callback: AudioCallback) -> None: ...
+
+    def stop(self) -> None: ...
+
+
+class PyAudioSource:
+    """
+    基于 pyaudio 的麦克风音频源，输出单声道 int16 采样点。
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        frames_per_buffer: int = 960,
+        device_index: Optional[int] = None,
+    ) -> None:
+        self.sample_rate = sample_rate
+        self.frames_per_buffer = frames_per_buffer
+        self.device_index = device_index
+        self.overflows = 0
+        self._pyaudio: Any = None
+        self._stream: Any = None
+
+    def start(self, callback: AudioCallback) -> None:
+        import pyaudio  # type: ignore
+
+        def on_audio(in_data: bytes, frame_count: int, time_info: Any, status: int):
+            if status & pyaudio.paInputOverflow:
+                self.overflows += 1
+            callback(np.frombuffer(in_data, dtype=np.int16))
+            return (None, pyaudio.paContinue)
+
+        self._pyaudio = pyaudio.PyAudio()
+        self._stream = self._pyaudio.open(
+            format=pyaudio.paInt16,
+            channels=1,
+            rate=self.sample_rate,
+            input=True,
+            input_device_index=self.device_index,
+            frames_per_buffer=self.frames_per_buffer,
+            stream_callback=on_audio,
+        )
+        self._stream.start_stream()
+
+    def stop(self) -> None:
+        if self._stream is not None:
+            self._stream.stop_stream()
+            self._stream.close()
+            self._stream = None
+        if self._pyaudio is not None:
+            self._pyaudio.terminate()
+            self._pyaudio = None
+
+
+class FakeAudioSource:
+    """
+    用于测试的音频源，在后台线程中按块推送给定的音频数据。
+
+    interval 为 0 时尽快推送，否则每块之间等待 interval 秒以模拟实时采集。
+    """
+
+    def __init__(
+        self,
+        data: npt.NDArray[Any],
+        block_size: int = 960,
+        sample_rate: int = 16000,
+        interval: float = 0.0,
+    ) -> None:
+        self.data = data
+        self.block_size = block_size
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, callback: AudioCallback) -> None:
+        def run() -> None:
+            for i in range(0, len(self.data), self.block_size):
+                if self._stopped.is_set():
+                    return
+                callback(self.data[i : i + self.block_size])
+                if self.interval:
+                    time.sleep(self.interval)
+            callback(None)
+
+        self._stopped.clear()
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+
+class AudioCapture:
+    """
+    实时音频采集管道。
+
+    音频回调线程把采样点写入无锁环形缓冲区，asyncio 读取端按帧读取。
+    缓冲区满时新数据会被丢弃并计入 `overruns` / `dropped`。
+
+    example usage:
+    ==============
+    capture = AudioCapture.for_asr(PyAudioSource(), asr.chunk_size)
+    async with capture:
+        async for frame in capture.frames():
+            text = asr.transcribe(frame)
+    """
+
+    def __init__(
+        self,
+        source: AudioSource,
+        frame_size: int,
+        capacity_frames: int = 32,
+        dtype: Any = np.int16,
+    ) -> None:
+        self.source = source
+        self.ring = RingBuffer(frame_size, capacity_frames, dtype)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready = asyncio.Event()
+        self._ended = False
+
+    @classmethod
+    def for_asr(
+        cls, source: AudioSource, chunk_size: List[int], capacity_frames: int = 32
+    ) -> "AudioCapture":
+        """按 FunASR 的 chunk_size 创建采集管道"""
+        return cls(
+            source,
+            frame_size_from_chunk_size(chunk_size, source.sample_rate),
+            capacity_frames,
+        )
+
+    @property
+    def frame_size(self) -> int:
+        return self.ring.frame_size
+
+    @property
+    def overruns(self) -> int:
+        return self.ring.overruns
+
+    @property
+    def dropped(self) -> int:
+        return self.ring.dropped
+
+    def _on_audio(self, data: Optional[npt.NDArray[Any]]) -> None:
+        # 运行在音频回调线程中
+        if data is None:
+            self._ended = True
+        elif self.ring.write(data) == 0:
+            return
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def start(self) -> None:
+        """开始采集"""
+        self._loop = asyncio.get_running_loop()
+        self._ended = False
+        self._ready.clear()
+        self.source.start(self._on_audio)
+        logger.info(f"开始音频采集，每帧 {self.frame_size} 个采样点")
+
+    async def stop(self) -> None:
+        """停止采集，已缓冲的数据仍然可以读取"""
+        await asyncio.to_thread(self.source.stop)
+        self._ended = True
+        self._ready.set()
+        if self.ring.overruns:
+            logger.warning(
+                f"音频采集溢出 {self.ring.overruns} 次，丢弃 {self.ring.dropped} 个采样点"
+            )
+
+    async def frames(self) -> AsyncIterator[npt.NDArray[Any]]:
+        """
+        按帧读取音频
+
+        每一帧都是环形缓冲区的视图，只在下一次迭代之前有效，需要保留时请自行拷贝。
+        音频源结束后，最后不足一帧的数据会作为最后一帧输出。
+        """
+        while True:
+            frame = self.ring.peek()
+            if frame is not None:
+                yield frame
+                self.ring.consume()
+                continue
+
+            if self._ended:
+                tail = self.ring.peek(self.ring.available())
+                if tail is not None:
+                    yield tail
+                    self.ring.consume(len(tail))
+                return
+
+            self._ready.clear()
+            if self.ring.available() >= self.frame_size or self._ended:
+                continue
+            await self._ready.wait()
+
+    async def __aenter__(self) -> "AudioCapture":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        await self.stop()
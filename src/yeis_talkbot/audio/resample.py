@@ -0,0 +1,184 @@
+import functools
+import math
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+
+from ..types import audio_type
+
+# 每个相位的滤波器长度，越长过渡带越窄、计算量越大
+DEFAULT_TAPS_PER_PHASE = 32
+KAISER_BETA = 8.6
+
+
+def filter_center(up: int, taps_per_phase: int) -> int:
+    """滤波器中心（群延迟）在上采样后采样率下的位置"""
+    return (up * taps_per_phase - 1) // 2
+
+
+@functools.lru_cache(maxsize=None)
+def polyphase_filter(
+    source_rate: int, target_rate: int, taps_per_phase: int = DEFAULT_TAPS_PER_PHASE
+) -> npt.NDArray[np.float64]:
+    """
+    计算并缓存 (source_rate, target_rate) 的多相滤波器系数
+
+    Returns:
+        npt.NDArray[np.float64]: 形状为 (up, taps_per_phase) 的只读数组，
+        第 p 行是第 p 个相位的系数，已按时间倒序排列，可以直接与输入窗口做点积
+    """
+    g = math.gcd(source_rate, target_rate)
+    up, down = target_rate // g, source_rate // g
+    length = up * taps_per_phase
+
+    # 在上采样后的采样率下设计低通滤波器，截止频率取两个奈奎斯特频率中较小的一个
+    # 窗口长度取奇数并在末尾补 0，使滤波器中心落在整数位置上
+    center = filter_center(up, taps_per_phase)
+    cutoff = 0.5 / max(up, down)
+    n = np.arange(length) - center
+    window = np.zeros(length)
+    window[: 2 * center + 1] = np.kaiser(2 * center + 1, KAISER_BETA)
+    h = 2 * cutoff * np.sinc(2 * cutoff * n) * window
+    h *= up / h.sum()
+
+    phases = h.reshape(taps_per_phase, up).T[:, ::-1].copy()
+    phases.setflags(write=False)
+    return phases
+
+
+def to_mono_float(chunk: npt.NDArray[Any]) -> npt.NDArray[np.float32]:
+    """将 (samples,) 或 (samples, channels) 的 int16/float32 音频混合为单声道 float32"""
+    if chunk.dtype == np.int16:
+        data = chunk.astype(np.float32) / 32768.0
+    elif chunk.dtype == np.float32:
+        data = chunk
+    else:
+        raise TypeError(f"Unsupported numpy array dtype for resampling: {chunk.dtype}")
+    if data.ndim == 2:
+        data = data.mean(axis=1, dtype=np.float32)
+    elif data.ndim != 1:
+        raise ValueError(f"Unsupported audio shape: {chunk.shape}")
+    return data
+
+
+def _from_float(data: npt.NDArray[Any], dtype: Any) -> audio_type:
+    if np.dtype(dtype) == np.int16:
+        return np.clip(np.round(data * 32768.0), -32768, 32767).astype(np.int16)
+    return data.astype(np.float32, copy=False)
+
+
+class Resampler:
+    """
+    流式混音与重采样。
+
+    对连续的音频块做单声道混合，并用多相 FIR 滤波器从 `source_rate` 重采样到 `target_rate`。
+    滤波器系数按 (source_rate, target_rate) 全局缓存；块之间保留滤波器历史和相位，
+    分块处理的结果与整段处理一致，不会在块边界产生杂音。输出已补偿滤波器延迟。
+
+    每个音频流使用一个实例:
+    ==============
+    resampler = Resampler(48000, 16000)
+    for chunk in stream:
+        asr.transcribe(resampler.process(chunk))
+    asr.transcribe(resampler.flush(), is_final=True)
+    """
+
+    def __init__(
+        self,
+        source_rate: int,
+        target_rate: int = 16000,
+        output_dtype: Any = np.float32,
+        taps_per_phase: int = DEFAULT_TAPS_PER_PHASE,
+    ) -> None:
+        """
+        Args:
+            source_rate (int): 输入采样率
+            target_rate (int): 输出采样率，FunASR 为 16000
+            output_dtype: 输出类型，np.float32（已归一化）或 np.int16
+            taps_per_phase (int): 每个相位的滤波器长度
+        """
+        if source_rate <= 0 or target_rate <= 0:
+            raise ValueError("Sample rates must be positive")
+        if np.dtype(output_dtype) not in (np.dtype(np.float32), np.dtype(np.int16)):
+            raise TypeError(f"Unsupported output dtype: {output_dtype}")
+        g = math.gcd(source_rate, target_rate)
+        self.source_rate = source_rate
+        self.target_rate = target_rate
+        self.output_dtype = output_dtype
+        self.up = target_rate // g
+        self.down = source_rate // g
+        self.taps = taps_per_phase
+        self.passthrough = source_rate == target_rate
+        self.filter = (
+            None
+            if self.passthrough
+            else polyphase_filter(source_rate, target_rate, taps_per_phase)
+        )
+        # 输出点直接取滤波器中心对应的位置，补偿滤波器延迟
+        self._center = filter_center(self.up, taps_per_phase)
+        self.reset()
+
+    def reset(self) -> None:
+        """清空滤波器状态，开始一个新的音频流"""
+        self._history = np.zeros(self.taps - 1, dtype=np.float64)
+        # 下一个输出点的序号，以及当前块之前的输入点数，两者会同步约减以保持有界
+        self._next_out = 0
+        self._in_offset = 0
+        self._total_in = 0
+        self._total_out = 0
+
+    def process(self, chunk: audio_type) -> audio_type:
+        """
+        处理一个音频块
+
+        Args:
+            chunk (audio_type): int16 或 float32 音频，形状为 (samples,) 或 (samples, channels)
+
+        Returns:
+            audio_type: 目标采样率的单声道音频，类型为 `output_dtype`
+        """
+        mono = to_mono_float(chunk)
+        if self.passthrough:
+            return _from_float(mono, self.output_dtype)
+        self._total_in += len(mono)
+        out = self._filter(mono)
+        self._total_out += len(out)
+        return _from_float(out, self.output_dtype)
+
+    def flush(self) -> audio_type:
+        """音频流结束时调用，输出滤波器中剩余的数据，之后实例会被重置"""
+        if self.passthrough:
+            return _from_float(np.zeros(0, dtype=np.float32), self.output_dtype)
+        expected = math.ceil(self._total_in * self.up / self.down)
+        out = self._filter(np.zeros(self.taps, dtype=np.float64))
+        out = out[: max(0, expected - self._total_out)]
+        self.reset()
+        return _from_float(out, self.output_dtype)
+
+    def _filter(self, mono: npt.NDArray[Any]) -> npt.NDArray[np.float64]:
+        assert self.filter is not None
+        padded = np.concatenate([self._history, mono])
+        available = self._in_offset + len(mono)
+
+        # 输出点 j 对应上采样位置 j * down + center，需要输入点 position // up
+        # 及其之前的 taps - 1 个点
+        ready = -(-(available * self.up - self._center) // self.down)
+        count = max(0, ready - self._next_out)
+        positions = (
+            self._next_out + np.arange(count, dtype=np.int64)
+        ) * self.down + self._center
+        starts = positions // self.up - self._in_offset
+        phases = positions % self.up
+
+        windows = np.lib.stride_tricks.sliding_window_view(padded, self.taps)
+        out = np.einsum("ij,ij->i", windows[starts], self.filter[phases])
+
+        self._next_out += count
+        self._in_offset = available
+        self._history = padded[len(padded) - (self.taps - 1) :]
+        # 每 up 个输出点正好对应 down 个输入点，约减以防止序号无限增长
+        cycles = min(self._next_out // self.up, self._in_offset // self.down)
+        self._next_out -= cycles * self.up
+        self._in_offset -= cycles * self.down
+        return out
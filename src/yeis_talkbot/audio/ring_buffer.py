@@ -0,0 +1,92 @@
+import numpy as np
+import numpy.typing as npt
+from typing import Any, Optional
+
+
+class RingBuffer:
+    """
+    单生产者/单消费者的无锁环形缓冲区。
+
+    生产者（音频回调线程）只修改写位置，消费者（asyncio 读取端）只修改读位置，
+    两个位置都是单调递增的整数，在 GIL 下读写是原子的，因此不需要加锁。
+
+    容量是 `frame_size` 的整数倍，消费者每次按整帧读取，
+    帧永远不会跨越缓冲区末尾，`peek` 返回的是缓冲区的视图而不是拷贝。
+    """
+
+    def __init__(
+        self, frame_size: int, capacity_frames: int = 32, dtype: Any = np.int16
+    ):
+        """
+        Args:
+            frame_size (int): 每帧的采样点数
+            capacity_frames (int): 缓冲区能容纳的帧数
+            dtype: 采样点类型，np.int16 或 np.float32
+        """
+        if frame_size <= 0 or capacity_frames <= 0:
+            raise ValueError("frame_size and capacity_frames must be positive")
+        self.frame_size = frame_size
+        self.capacity = frame_size * capacity_frames
+        self._buffer: npt.NDArray[Any] = np.zeros(self.capacity, dtype=dtype)
+        self._write_pos = 0
+        self._read_pos = 0
+        self.overruns = 0
+        self.dropped = 0
+
+    @property
+    def dtype(self) -> Any:
+        return self._buffer.dtype
+
+    def available(self) -> int:
+        """可读的采样点数"""
+        return self._write_pos - self._read_pos
+
+    def free(self) -> int:
+        """可写的采样点数"""
+        return self.capacity - self.available()
+
+    def write(self, data: npt.NDArray[Any]) -> int:
+        """
+        生产者写入采样点，缓冲区满时丢弃放不下的部分并记录一次溢出
+
+        Returns:
+            int: 实际写入的采样点数
+        """
+        count = min(len(data), self.free())
+        if count < len(data):
+            self.overruns += 1
+            self.dropped += len(data) - count
+        if count == 0:
+            return 0
+
+        start = self._write_pos % self.capacity
+        first = min(count, self.capacity - start)
+        self._buffer[start : start + first] = data[:first]
+        if first < count:
+            self._buffer[: count - first] = data[first:count]
+        # 数据写完后再发布写位置，消费者看到新位置时数据一定已经就绪
+        self._write_pos += count
+        return count
+
+    def peek(self, size: Optional[int] = None) -> Optional[npt.NDArray[Any]]:
+        """
+        消费者查看下一帧，不移动读位置
+
+        返回的视图在调用 `consume` 之前有效。
+
+        Args:
+            size (int): 读取的采样点数，默认为一整帧；只有最后的不完整帧才需要指定
+
+        Returns:
+            Optional[npt.NDArray]: 数据视图，数据不足时返回 None
+        """
+        size = self.frame_size if size is None else min(size, self.frame_size)
+        if size <= 0 or self.available() < size:
+            return None
+        start = self._read_pos % self.capacity
+        return self._buffer[start : start + size]
+
+    def consume(self, size: Optional[int] = None) -> None:
+        """消费者移动读位置，释放已处理的数据"""
+        size = self.frame_size if size is None else size
+        self._read_pos += min(size, self.available())
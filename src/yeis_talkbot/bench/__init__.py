@@ -0,0 +1,29 @@
+from .latency import (
+    BenchmarkOptions,
+    FakeAutoModel,
+    FakeCommunicate,
+    FakeLLM,
+    LatencyStats,
+    LevelReport,
+    TurnLatencyBenchmark,
+    fake_edge_tts_module,
+    format_report,
+    load_turn,
+    run_benchmark,
+    synthetic_turn,
+)
+
+__all__ = [
+    "BenchmarkOptions",
+    "FakeAutoModel",
+    "FakeCommunicate",
+    "FakeLLM",
+    "LatencyStats",
+    "LevelReport",
+    "TurnLatencyBenchmark",
+    "fake_edge_tts_module",
+    "format_report",
+    "load_turn",
+    "run_benchmark",
+    "synthetic_turn",
+]
@@ -0,0 +1,565 @@
+import argparse
+import asyncio
+import functools
+import logging
+import math
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Sequence, cast
+
+import numpy as np
+import numpy.typing as npt
+import soundfile as sf  # type: ignore
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..audio import Resampler, frame_size_from_chunk_size
+from ..configs import DEFAULT_STREAMING_CHUNK_SIZE, MemoryConfig
+from ..event import BaseEvent, EventBus, TTSEvent
+from ..memory import SessionMemoryManager
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+SENTENCE_ENDINGS = "。！？!?；;"
+
+
+class BenchmarkOptions(BaseModel):
+    """假后端的延迟和管道参数，单位均为秒"""
+
+    model_config = ConfigDict(frozen=True)
+
+    frame_ms: int = Field(
+        default=60, description="Audio frame pushed into the pipeline"
+    )
+    chunk_size: List[int] = Field(
+        default_factory=lambda: list(DEFAULT_STREAMING_CHUNK_SIZE),
+        description="FunASR streaming chunk size",
+    )
+    vad_threshold: float = Field(
+        default=0.01, description="RMS above which a frame is speech"
+    )
+    vad_hangover: float = Field(
+        default=0.3, description="Trailing silence that ends a turn"
+    )
+    asr_delay: float = Field(
+        default=0.02, description="Fixed cost of one generate call"
+    )
+    asr_rtf: float = Field(default=0.05, description="Extra cost per second of audio")
+    llm_first_token_delay: float = Field(
+        default=0.3, description="Time to first LLM token"
+    )
+    llm_token_delay: float = Field(default=0.02, description="Delay between LLM tokens")
+    llm_reply: str = Field(default="好的，我明白了。还有什么可以帮您？")
+    tts_first_chunk_delay: float = Field(
+        default=0.15, description="Time to first TTS chunk"
+    )
+    tts_chunk_delay: float = Field(default=0.01, description="Delay between TTS chunks")
+    tts_chunks: int = Field(default=8, description="Audio chunks per sentence")
+    playout_delay: float = Field(
+        default=0.06, description="Jitter buffer before playback"
+    )
+    turns_per_session: int = Field(default=3)
+    turn_gap: float = Field(default=0.2, description="Pause between turns of a session")
+
+
+class FakeAutoModel:
+    """
+    确定性的 `funasr.AutoModel` 替身。
+
+    `generate` 与 AutoModel 的流式接口相同，同步阻塞 `delay + rtf * 音频秒数`，
+    模拟在事件循环中执行的模型推理。每个非空音频块输出 `text` 中的下一个字。
+    """
+
+    def __init__(self, delay: float = 0.02, rtf: float = 0.05, text: str = "你好"):
+        self.delay = delay
+        self.rtf = rtf
+        self.text = text
+
+    def generate(
+        self,
+        input: npt.NDArray[np.float32],
+        cache: Dict[str, Any],
+        is_final: bool = False,
+        **kwargs: Any,
+    ) -> List[Dict[str, Any]]:
+        time.sleep(self.delay + self.rtf * len(input) / SAMPLE_RATE)
+        if not len(input):
+            return [{"text": ""}]
+        index = cache.get("chunks", 0)
+        cache["chunks"] = index + 1
+        return [{"text": self.text[index % len(self.text)]}]
+
+
+class FakeLLM:
+    """确定性的流式 LLM 替身，按字输出固定回复"""
+
+    def __init__(
+        self,
+        reply: str = "好的。",
+        first_token_delay: float = 0.3,
+        token_delay: float = 0.02,
+    ) -> None:
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    async def astream(self, text: str) -> AsyncIterator[str]:
+        await asyncio.sleep(self.first_token_delay)
+        for i, token in enumerate(self.reply):
+            if i:
+                await asyncio.sleep(self.token_delay)
+            yield token
+
+
+class FakeCommunicate:
+    """确定性的 `edge_tts.Communicate` 替身，按固定节奏返回 MP3 数据块"""
+
+    def __init__(
+        self,
+        text: str,
+        voice: str = "",
+        rate: str = "",
+        volume: str = "",
+        first_chunk_delay: float = 0.15,
+        chunk_delay: float = 0.01,
+        chunks: int = 8,
+    ) -> None:
+        self.text = text
+        self.first_chunk_delay = first_chunk_delay
+        self.chunk_delay = chunk_delay
+        self.chunks = chunks
+
+    async def stream(self) -> AsyncIterator[Dict[str, Any]]:
+        await asyncio.sleep(self.first_chunk_delay)
+        for i in range(self.chunks):
+            if i:
+                await asyncio.sleep(self.chunk_delay)
+            yield {"type": "audio", "data": b"\xff\xfb" + bytes(142)}
+
+
+def fake_edge_tts_module(options: BenchmarkOptions) -> ModuleType:
+    """可以赋值给 `EdgeTTS.edge_tts` 的假 edge_tts 模块"""
+    module = ModuleType("edge_tts")
+    module.Communicate = functools.partial(  # type: ignore[attr-defined]
+        FakeCommunicate,
+        first_chunk_delay=options.tts_first_chunk_delay,
+        chunk_delay=options.tts_chunk_delay,
+        chunks=options.tts_chunks,
+    )
+    return module
+
+
+class AudioFrameEvent(BaseEvent):
+    """一帧麦克风音频，`spoken_at` 为这一帧说完的时刻"""
+
+    session_id: str = ""
+    audio: Any = None
+    spoken_at: float = 0.0
+
+
+class SpeechEvent(BaseEvent):
+    """VAD 切分出的语音块，`is_final` 表示一句话结束"""
+
+    session_id: str = ""
+    audio: Any = None
+    is_final: bool = False
+
+
+class LLMEvent(BaseEvent):
+    """识别完成的一句话，交给 LLM 生成回复"""
+
+    session_id: str = ""
+    text: str = ""
+
+
+class LatencyStats(BaseModel):
+    count: int
+    mean: float
+    p50: float
+    p95: float
+    p99: float
+    max: float
+
+
+class LevelReport(BaseModel):
+    """某个并发数下的延迟统计"""
+
+    concurrency: int
+    turns: int
+    failed: int
+    mouth_to_ear: LatencyStats
+    time_to_first_audio: LatencyStats
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """最近秩百分位数"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(q / 100 * len(ordered)) - 1)]
+
+
+def summarize(values: Sequence[float]) -> LatencyStats:
+    return LatencyStats(
+        count=len(values),
+        mean=sum(values) / len(values) if values else 0.0,
+        p50=percentile(values, 50),
+        p95=percentile(values, 95),
+        p99=percentile(values, 99),
+        max=max(values, default=0.0),
+    )
+
+
+def synthetic_turn(
+    speech: float = 0.8, silence: float = 0.6, frequency: float = 220.0
+) -> npt.NDArray[np.float32]:
+    """一段确定性的测试语音：正弦波之后跟一段静音"""
+    t = np.arange(int(speech * SAMPLE_RATE)) / SAMPLE_RATE
+    voiced = 0.3 * np.sin(2 * np.pi * frequency * t)
+    return np.concatenate([voiced, np.zeros(int(silence * SAMPLE_RATE))]).astype(
+        np.float32
+    )
+
+
+def load_turn(path: str) -> npt.NDArray[np.float32]:
+    """读取录音并转换为 16kHz 单声道 float32"""
+    data, sample_rate = sf.read(path, dtype="float32", always_2d=False)
+    resampler = Resampler(sample_rate, SAMPLE_RATE)
+    return np.concatenate([resampler.process(data), resampler.flush()])
+
+
+@dataclass
+class _Turn:
+    mouth_end: float = 0.0
+    speech_end: float = 0.0
+    first_audio: Optional[float] = None
+
+
+@dataclass
+class _VADState:
+    in_speech: bool = False
+    silence: float = 0.0
+    last_voiced: float = 0.0
+    buffered: int = 0
+    buffer: List[npt.NDArray[np.float32]] = field(default_factory=list)
+
+
+class TurnLatencyBenchmark:
+    """
+    端到端轮次延迟基准测试。
+
+    每个会话按实时节奏把录音逐帧发布到事件总线，依次经过
+    VAD -> ASR -> LLM -> TTS 四个处理器:
+
+    - time-to-first-audio: VAD 判定一句话结束到第一块 TTS 音频产生
+    - mouth-to-ear: 用户最后一个语音帧说完到第一块回复音频被播放，
+      包含 VAD 的尾部静音等待和播放缓冲 `playout_delay`
+
+    ASR 使用共享的 FunASR 实例（可以替换为 `FakeAutoModel`），会话的流式缓存
+    由 `SessionMemoryManager` 管理。默认使用独立的 EventBus，不影响全局 `event_bus`。
+
+    example usage:
+    ==============
+    asr = FunASR(app_config, model=FakeAutoModel())
+    tts = EdgeTTS(app_config, store=OutputStore(backend="memory"))
+    tts.edge_tts = fake_edge_tts_module(options)
+    bench = TurnLatencyBenchmark(asr, tts, FakeLLM(), options)
+    report = await bench.run([synthetic_turn()], concurrency=4)
+    """
+
+    def __init__(
+        self,
+        asr: Any,
+        tts: Any,
+        llm: Any,
+        options: Optional[BenchmarkOptions] = None,
+        bus: Optional[EventBus] = None,
+        memory_config: Optional[MemoryConfig] = None,
+    ) -> None:
+        """
+        Args:
+            asr: 流式 ASR，需要 `transcribe(chunk, is_final, chunk_size)` 和 `cache`，例如 FunASR
+            tts: 需要 `stream(text)` 异步迭代器，例如 EdgeTTS
+            llm: 需要 `astream(text)` 异步迭代器，例如 FakeLLM
+            options (BenchmarkOptions): 管道参数
+            bus (EventBus): 事件总线，默认新建一个
+            memory_config (MemoryConfig): 会话状态的内存配置
+        """
+        self.asr = asr
+        self.tts = tts
+        self.llm = llm
+        self.options = options or BenchmarkOptions()
+        self.bus = bus or EventBus()
+        self.sessions = SessionMemoryManager(memory_config)
+        self.frame_size = SAMPLE_RATE * self.options.frame_ms // 1000
+        self.asr_chunk = frame_size_from_chunk_size(self.options.chunk_size)
+        self._vad: Dict[str, _VADState] = {}
+        self._turns: Dict[str, _Turn] = {}
+        self.failed = 0
+
+    def attach(self) -> None:
+        self.bus.subscribe(AudioFrameEvent, self._on_frame)
+        self.bus.subscribe(SpeechEvent, self._on_speech)
+        self.bus.subscribe(LLMEvent, self._on_llm)
+        self.bus.subscribe(TTSEvent, self._on_tts)
+
+    def detach(self) -> None:
+        self.bus.unsubscribe(AudioFrameEvent, self._on_frame)
+        self.bus.unsubscribe(SpeechEvent, self._on_speech)
+        self.bus.unsubscribe(LLMEvent, self._on_llm)
+        self.bus.unsubscribe(TTSEvent, self._on_tts)
+
+    async def _on_frame(self, event: BaseEvent) -> None:
+        """能量 VAD"""
+        if not isinstance(event, AudioFrameEvent):
+            return
+        state = self._vad.setdefault(event.session_id, _VADState())
+        frame: npt.NDArray[np.float32] = event.audio
+        duration = len(frame) / SAMPLE_RATE
+        voiced = bool(
+            len(frame)
+            and np.sqrt(np.mean(np.square(frame))) >= self.options.vad_threshold
+        )
+
+        if voiced:
+            state.in_speech = True
+            state.silence = 0.0
+            state.last_voiced = event.spoken_at
+        elif not state.in_speech:
+            return
+        else:
+            state.silence += duration
+
+        state.buffer.append(frame)
+        state.buffered += len(frame)
+        if state.silence >= self.options.vad_hangover:
+            await self._end_of_speech(event.session_id, state)
+        elif state.buffered >= self.asr_chunk:
+            chunk = np.concatenate(state.buffer)
+            state.buffer.clear()
+            state.buffered = 0
+            await self.bus.publish(
+                SpeechEvent(session_id=event.session_id, audio=chunk)
+            )
+
+    async def _end_of_speech(self, session_id: str, state: _VADState) -> None:
+        chunk = (
+            np.concatenate(state.buffer)
+            if state.buffer
+            else np.zeros(0, dtype=np.float32)
+        )
+        self._turns[session_id] = _Turn(
+            mouth_end=state.last_voiced, speech_end=time.perf_counter()
+        )
+        self._vad[session_id] = _VADState()
+        await self.bus.publish(
+            SpeechEvent(session_id=session_id, audio=chunk, is_final=True)
+        )
+
+    async def _on_speech(self, event: BaseEvent) -> None:
+        """流式 ASR，一句话结束后发布 LLMEvent"""
+        if not isinstance(event, SpeechEvent):
+            return
+        self.sessions.transcribe(
+            event.session_id,
+            self.asr,
+            event.audio,
+            is_final=event.is_final,
+            chunk_size=self.options.chunk_size,
+        )
+        if not event.is_final:
+            return
+        state = self.sessions.get(event.session_id)
+        text = state.transcript[-1] if state.transcript else ""
+        await self.bus.publish(LLMEvent(session_id=event.session_id, text=text))
+
+    async def _on_llm(self, event: BaseEvent) -> None:
+        """流式 LLM，每生成一句就发布 TTSEvent"""
+        if not isinstance(event, LLMEvent):
+            return
+        sentence = ""
+        async for token in self.llm.astream(event.text):
+            sentence += token
+            if token in SENTENCE_ENDINGS:
+                await self.bus.publish(
+                    TTSEvent(session_id=event.session_id, text=sentence)
+                )
+                sentence = ""
+        if sentence:
+            await self.bus.publish(TTSEvent(session_id=event.session_id, text=sentence))
+
+    async def _on_tts(self, event: BaseEvent) -> None:
+        if not isinstance(event, TTSEvent):
+            return
+        turn = self._turns.get(event.session_id)
+        async for data in self.tts.stream(event.text):
+            if data and turn is not None and turn.first_audio is None:
+                turn.first_audio = time.perf_counter()
+        event.status = "completed"
+
+    async def _run_session(
+        self,
+        session_id: str,
+        turns: Sequence[npt.NDArray[np.float32]],
+        mouth_to_ear: List[float],
+        first_audio: List[float],
+    ) -> None:
+        for index in range(self.options.turns_per_session):
+            audio = turns[index % len(turns)]
+            self._turns.pop(session_id, None)
+            start = time.perf_counter()
+            frames = range(0, len(audio), self.frame_size)
+            for i, begin in enumerate(frames):
+                # 按实时节奏发送，第 i 帧在 start + (i + 1) * 帧长 时说完
+                spoken_at = start + (i + 1) * self.options.frame_ms / 1000
+                delay = spoken_at - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await self.bus.publish(
+                    AudioFrameEvent(
+                        session_id=session_id,
+                        audio=audio[begin : begin + self.frame_size],
+                        spoken_at=spoken_at,
+                    )
+                )
+            state = self._vad.get(session_id)
+            if state is not None and state.in_speech:
+                # 录音结束时仍在说话，以录音末尾作为一句话的结束
+                await self._end_of_speech(session_id, state)
+
+            turn = self._turns.pop(session_id, None)
+            if turn is None or turn.first_audio is None:
+                self.failed += 1
+                logger.warning(f"会话 {session_id} 第 {index} 轮没有产生音频")
+            else:
+                first_audio.append(turn.first_audio - turn.speech_end)
+                mouth_to_ear.append(
+                    turn.first_audio + self.options.playout_delay - turn.mouth_end
+                )
+            await asyncio.sleep(self.options.turn_gap)
+        self.sessions.remove(session_id)
+        self._vad.pop(session_id, None)
+
+    async def run(
+        self, turns: Sequence[npt.NDArray[np.float32]], concurrency: int = 1
+    ) -> LevelReport:
+        """
+        以指定并发数运行所有会话
+
+        Args:
+            turns: 16kHz 单声道 float32 录音，每个会话依次循环使用
+            concurrency (int): 同时进行的会话数
+        """
+        mouth_to_ear: List[float] = []
+        first_audio: List[float] = []
+        self.failed = 0
+        self.attach()
+        try:
+            await asyncio.gather(
+                *(
+                    self._run_session(f"bench-{i}", turns, mouth_to_ear, first_audio)
+                    for i in range(concurrency)
+                )
+            )
+        finally:
+            self.detach()
+        return LevelReport(
+            concurrency=concurrency,
+            turns=len(first_audio),
+            failed=self.failed,
+            mouth_to_ear=summarize(mouth_to_ear),
+            time_to_first_audio=summarize(first_audio),
+        )
+
+
+def format_report(reports: Sequence[LevelReport]) -> str:
+    """以毫秒为单位的延迟表格"""
+    lines = [
+        f"{'sessions':>8} {'turns':>6} {'failed':>6}  "
+        f"{'m2e p50':>8} {'p95':>8} {'p99':>8}  {'ttfa p50':>8} {'p95':>8} {'p99':>8}"
+    ]
+    for report in reports:
+        m2e = report.mouth_to_ear
+        ttfa = report.time_to_first_audio
+        lines.append(
+            f"{report.concurrency:>8} {report.turns:>6} {report.failed:>6}  "
+            f"{m2e.p50 * 1000:>8.1f} {m2e.p95 * 1000:>8.1f} {m2e.p99 * 1000:>8.1f}  "
+            f"{ttfa.p50 * 1000:>8.1f} {ttfa.p95 * 1000:>8.1f} {ttfa.p99 * 1000:>8.1f}"
+        )
+    return "\n".join(lines)
+
+
+async def run_benchmark(
+    asr: Any,
+    tts: Any,
+    llm: Any,
+    turns: Sequence[npt.NDArray[np.float32]],
+    concurrency_levels: Sequence[int] = (1, 2, 4, 8),
+    options: Optional[BenchmarkOptions] = None,
+) -> List[LevelReport]:
+    """依次在每个并发数下运行基准测试"""
+    reports: List[LevelReport] = []
+    for concurrency in concurrency_levels:
+        bench = TurnLatencyBenchmark(asr, tts, llm, options)
+        report = await bench.run(turns, concurrency)
+        logger.info(
+            f"并发 {concurrency}: mouth-to-ear p95 {report.mouth_to_ear.p95:.3f}s"
+        )
+        reports.append(report)
+    return reports
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """使用假后端运行端到端延迟基准测试"""
+    parser = argparse.ArgumentParser(
+        description="End-to-end turn latency benchmark with fake backends"
+    )
+    parser.add_argument("wav", nargs="*", help="recorded turns, default synthetic")
+    parser.add_argument("--config", default="configs/config.yaml")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    for name, info in BenchmarkOptions.model_fields.items():
+        if info.annotation in (int, float):
+            parser.add_argument(
+                f"--{name.replace('_', '-')}",
+                type=cast(Callable[[str], Any], info.annotation),
+                default=info.default,
+                help=info.description,
+            )
+    args = parser.parse_args(argv)
+
+    from ..asr import FunASR
+    from ..configs import AppConfig, EdgeTTSConfig
+    from ..tts import EdgeTTS, OutputStore
+
+    options = BenchmarkOptions(
+        **{
+            name: getattr(args, name)
+            for name in BenchmarkOptions.model_fields
+            if hasattr(args, name)
+        }
+    )
+    # 假 LLM 不会访问 API
+    os.environ.setdefault("OPENAI_API_KEY", "offline-benchmark")
+    app_config = AppConfig.from_yaml(args.config)
+    asr = FunASR(app_config, model=FakeAutoModel(options.asr_delay, options.asr_rtf))
+    tts = EdgeTTS(
+        app_config, store=OutputStore(backend="memory"), config=EdgeTTSConfig()
+    )
+    tts.edge_tts = fake_edge_tts_module(options)
+    llm = FakeLLM(
+        options.llm_reply, options.llm_first_token_delay, options.llm_token_delay
+    )
+    turns = [load_turn(path) for path in args.wav] or [synthetic_turn()]
+
+    reports = asyncio.run(
+        run_benchmark(asr, tts, llm, turns, args.concurrency, options)
+    )
+    print(format_report(reports))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,16 @@
-from .configs import AppConfig, ASRConfig, TTSConfig, VADConfig, LLMConfig
+from .configs import (
+    AppConfig,
+    ASRConfig,
+    TTSConfig,
+    VADConfig,
+    LLMConfig,
+    MemoryConfig,
+    AdmissionConfig,
+    DEFAULT_STREAMING_CHUNK_SIZE,
+)
 from .tts_configs import EdgeTTSConfig
+from .loader import load_yaml
+from .service import ConfigService, ConfigSnapshot, SessionConfig, SessionOverrides
 
 __all__ = [
     "AppConfig",
@@ -8,4 +19,12 @@ __all__ = [
     "TTSConfig",
     "VADConfig",
     "LLMConfig",
+    "MemoryConfig",
+    "AdmissionConfig",
+    "DEFAULT_STREAMING_CHUNK_SIZE",
+    "load_yaml",
+    "ConfigService",
+    "ConfigSnapshot",
+    "SessionConfig",
+    "SessionOverrides",
 ]
@@ -1,18 +1,41 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import Optional, Dict
-import yaml
+from typing import Literal, Optional, Dict
+
+from .loader import load_yaml
+
+# FunASR 默认流式参数
+DEFAULT_STREAMING_CHUNK_SIZE = [0, 10, 5]
 
 
 class TTSConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     index_tts: Dict[str, str] = Field({"config": "checkpoints/checkpoints-config.yaml"})
     edge_tts: Dict[str, str] = Field({"config": "config/edge-tts.yaml"})
     out_path: str = Field(
         default="tmp/tts/", description="Output path for TTS audio files"
     )
+    output_backend: Literal["disk", "memory"] = Field(
+        default="disk", description="Storage backend for TTS audio files"
+    )
+    max_output_bytes: int = Field(
+        default=512 * 1024 * 1024, description="Disk quota for TTS audio files"
+    )
+    max_output_files: int = Field(
+        default=10000, description="Maximum number of stored TTS audio files"
+    )
+    output_ttl: float = Field(
+        default=600.0, description="Seconds before an unused TTS audio file expires"
+    )
+    gc_interval: float = Field(
+        default=60.0, description="Seconds between TTS audio garbage collections"
+    )
 
 
 class ASRConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     FunASR: Dict[str, str] = Field(
         default={
             "model": "paraformer-zh-streaming",
@@ -22,6 +45,8 @@ class ASRConfig(BaseModel):
 
 
 class VADConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     FunASR: Dict[str, str] = Field(
         default={
             "model": "fsmn-vad",
@@ -31,6 +56,8 @@ class VADConfig(BaseModel):
 
 
 class LLMConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     model: str = Field("gpt4o", description="The model to use for LLM")
     base_url: str = Field(
         default="https://api.openai.com/v1/chat/completions",
@@ -42,6 +69,55 @@ class LLMConfig(BaseModel):
     timeout: Optional[int | None] = Field(None, description="Timeout for LLM requests")
 
 
+class MemoryConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    max_sessions: int = Field(
+        default=1000, description="Maximum number of live sessions"
+    )
+    session_ttl: float = Field(
+        default=1800.0, description="Seconds of inactivity before a session is evicted"
+    )
+    max_messages: int = Field(
+        default=64, description="Maximum messages kept per session before compaction"
+    )
+    ram_budget: int = Field(
+        default=256 * 1024 * 1024,
+        description="Bytes of session state kept in RAM before spilling to disk",
+    )
+    spill_dir: str = Field(
+        default="tmp/sessions", description="Directory for spilled session state"
+    )
+    spill_after: float = Field(
+        default=300.0, description="Seconds of inactivity before a session is spilled"
+    )
+    max_utterances: int = Field(
+        default=200, description="Finished utterances kept per session transcript"
+    )
+
+
+class AdmissionConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    max_sessions: int = Field(
+        default=200, description="Hard limit of concurrent sessions"
+    )
+    degrade_sessions: int = Field(
+        default=160,
+        description="Sessions above this number are admitted in degraded mode",
+    )
+    max_queue_depth: int = Field(
+        default=500,
+        description="In-flight events above which new sessions are rejected",
+    )
+    latency_slo: float = Field(
+        default=2.0, description="Per-stage p95 latency in seconds before degrading"
+    )
+    latency_window: int = Field(
+        default=200, description="Number of recent samples kept per stage"
+    )
+
+
 class AppConfig(BaseSettings):
     """
     example usage:
@@ -56,11 +132,14 @@ class AppConfig(BaseSettings):
     ASR: ASRConfig
     VAD: VADConfig
     LLM: LLMConfig
+    Memory: MemoryConfig = Field(default_factory=MemoryConfig)
+    Admission: AdmissionConfig = Field(default_factory=AdmissionConfig)
 
-    model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
+    model_config = SettingsConfigDict(
+        env_file=".env", env_file_encoding="utf-8", frozen=True
+    )
 
     @classmethod
     def from_yaml(cls, yaml_file: str):
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(stream=f)
+        config_data = load_yaml(yaml_file)
         return cls(**config_data)
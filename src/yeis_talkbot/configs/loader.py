@@ -0,0 +1,36 @@
+import copy
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+import yaml
+
+# 绝对路径 -> ((mtime_ns, size), 解析结果)
+_cache: Dict[str, Tuple[Tuple[int, int], Any]] = {}
+_lock = threading.Lock()
+
+
+def file_stamp(path: str) -> Tuple[int, int]:
+    """文件的修改时间和大小，用于判断文件是否变化"""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_yaml(yaml_file: str) -> Any:
+    """
+    读取 YAML 文件，文件未变化时直接返回缓存的解析结果
+
+    返回值是缓存的深拷贝，调用方可以随意修改。
+    """
+    path = os.path.abspath(yaml_file)
+    stamp = file_stamp(path)
+    with _lock:
+        cached = _cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return copy.deepcopy(cached[1])
+
+    with open(path, "r", encoding="utf-8") as f:
+        data = yaml.safe_load(stream=f)
+    with _lock:
+        _cache[path] = (stamp, data)
+    return copy.deepcopy(data)
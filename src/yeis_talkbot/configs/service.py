@@ -0,0 +1,208 @@
+import asyncio
+import contextlib
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel, ConfigDict
+
+from .configs import AppConfig, DEFAULT_STREAMING_CHUNK_SIZE
+from .loader import file_stamp
+from .tts_configs import EdgeTTSConfig
+
+logger = logging.getLogger(__name__)
+
+
+class ConfigSnapshot(BaseModel):
+    """某一时刻的完整配置，不可修改"""
+
+    model_config = ConfigDict(frozen=True)
+
+    version: int
+    app: AppConfig
+    edge_tts: EdgeTTSConfig
+
+
+class SessionOverrides(BaseModel):
+    """会话级别的配置覆盖，只影响单个会话，不需要重新加载模型"""
+
+    model_config = ConfigDict(frozen=True)
+
+    voice: Optional[str] = None
+    rate: Optional[str] = None
+    volume: Optional[str] = None
+    chunk_size: Optional[List[int]] = None
+
+
+class SessionConfig(BaseModel):
+    """合并了会话覆盖后的配置视图"""
+
+    model_config = ConfigDict(frozen=True)
+
+    version: int
+    edge_tts: EdgeTTSConfig
+    chunk_size: List[int]
+
+
+class ConfigService:
+    """
+    配置服务。
+
+    YAML 只在文件变化时重新解析；每次重新加载都会生成新的不可变快照并整体替换，
+    读取方拿到的快照在使用期间不会被修改。后台任务轮询配置文件（包括被引用的
+    edge-tts 配置），文件变化时自动重新加载，无需重启进程。新配置校验失败时保留旧快照。
+
+    example usage:
+    ==============
+    service = ConfigService("configs/config.yaml")
+    await service.start()
+    tts = EdgeTTS(service.snapshot.app, config=service.snapshot.edge_tts)
+    service.subscribe(lambda snapshot: tts.apply_config(snapshot.edge_tts))
+
+    service.set_overrides("session-1", voice="zh-CN-YunxiNeural")
+    voice = service.session_config("session-1").edge_tts.voice
+    """
+
+    def __init__(self, path: str = "configs/config.yaml", poll_interval: float = 2.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self._stamps: Dict[str, Tuple[int, int]] = {}
+        self._subscribers: List[Callable[[ConfigSnapshot], None]] = []
+        self._overrides: Dict[str, SessionOverrides] = {}
+        self._watch_task: Optional[asyncio.Task[None]] = None
+        self._snapshot = self._load(version=1)
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        """当前配置快照"""
+        return self._snapshot
+
+    @staticmethod
+    def _stamp(path: str) -> Tuple[int, int]:
+        try:
+            return file_stamp(path)
+        except OSError:
+            return (0, 0)
+
+    def _load(self, version: int) -> ConfigSnapshot:
+        # 先记录文件状态再读取，读取期间发生的修改会在下一次轮询时被发现
+        self._stamps = {self.path: self._stamp(self.path)}
+        app = AppConfig.from_yaml(self.path)
+        edge_path = app.TTS.edge_tts["config"]
+        self._stamps[edge_path] = self._stamp(edge_path)
+        edge_tts = EdgeTTSConfig.from_yaml(edge_path)
+        return ConfigSnapshot(version=version, app=app, edge_tts=edge_tts)
+
+    def _changed(self) -> bool:
+        return any(self._stamp(path) != stamp for path, stamp in self._stamps.items())
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        配置文件变化时重新加载
+
+        Args:
+            force (bool): 即使文件没有变化也重新加载
+
+        Returns:
+            bool: 是否生成了新的快照
+        """
+        if not force and not self._changed():
+            return False
+        try:
+            snapshot = self._load(version=self._snapshot.version + 1)
+        except Exception as e:
+            logger.error(
+                f"重新加载配置失败，继续使用版本 {self._snapshot.version}: {e}"
+            )
+            return False
+
+        self._snapshot = snapshot
+        logger.info(f"配置已重新加载，版本 {snapshot.version}")
+        for callback in list(self._subscribers):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                logger.error(f"配置变更回调执行失败: {e}")
+        return True
+
+    def subscribe(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        """订阅配置变更，新快照生效后回调"""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[ConfigSnapshot], None]) -> None:
+        """取消订阅配置变更"""
+        with contextlib.suppress(ValueError):
+            self._subscribers.remove(callback)
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            self.reload()
+
+    async def start(self) -> None:
+        """开始监视配置文件"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """停止监视配置文件"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._watch_task
+            self._watch_task = None
+
+    def set_overrides(
+        self,
+        session_id: str,
+        voice: Optional[str] = None,
+        rate: Optional[str] = None,
+        volume: Optional[str] = None,
+        chunk_size: Optional[List[int]] = None,
+    ) -> SessionOverrides:
+        """
+        设置会话级别的配置覆盖，未指定的字段保留之前的覆盖值
+
+        Returns:
+            SessionOverrides: 合并后的覆盖
+        """
+        current = self._overrides.get(session_id, SessionOverrides())
+        updates = {
+            key: value
+            for key, value in {
+                "voice": voice,
+                "rate": rate,
+                "volume": volume,
+                "chunk_size": chunk_size,
+            }.items()
+            if value is not None
+        }
+        overrides = current.model_copy(update=updates)
+        self._overrides[session_id] = overrides
+        return overrides
+
+    def clear_overrides(self, session_id: str) -> None:
+        """移除会话的配置覆盖"""
+        self._overrides.pop(session_id, None)
+
+    def session_config(self, session_id: str) -> SessionConfig:
+        """当前快照合并会话覆盖后的配置"""
+        snapshot = self._snapshot
+        overrides = self._overrides.get(session_id)
+        edge_tts = snapshot.edge_tts
+        chunk_size = [
+            int(x)
+            for x in snapshot.app.ASR.FunASR.get(
+                "chunk_size", DEFAULT_STREAMING_CHUNK_SIZE
+            )
+        ]
+        if overrides is not None:
+            updates = overrides.model_dump(
+                include={"voice", "rate", "volume"}, exclude_none=True
+            )
+            if updates:
+                edge_tts = edge_tts.model_copy(update=updates)
+            if overrides.chunk_size is not None:
+                chunk_size = list(overrides.chunk_size)
+        return SessionConfig(
+            version=snapshot.version, edge_tts=edge_tts, chunk_size=chunk_size
+        )
@@ -1,14 +1,23 @@
-from pydantic import BaseModel, Field
-import yaml
+from pydantic import BaseModel, ConfigDict, Field
+
+from ..types import audio_format_type
+from .loader import load_yaml
 
 
 class EdgeTTSConfig(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     voice: str = Field(default="zh-CN-XiaoxiaoNeural", description="Voice for Edge TTS")
     rate: str = Field(default="+0%", description="Speech rate for Edge TTS")
     volume: str = Field(default="+0%", description="Volume for Edge TTS")
+    output_format: audio_format_type = Field(
+        default="mp3", description="Output audio format for Edge TTS"
+    )
+    sample_rate: int = Field(
+        default=24000, description="Output sample rate, ignored for mp3 passthrough"
+    )
 
     @classmethod
     def from_yaml(cls, yaml_file: str):
-        with open(yaml_file, "r", encoding="utf-8") as f:
-            config_data = yaml.safe_load(stream=f)
+        config_data = load_yaml(yaml_file)
         return cls(**config_data)
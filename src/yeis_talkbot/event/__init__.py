@@ -1,5 +1,6 @@
 from .event import BaseEvent, BaseHandler, TTSEvent, TTSHandler, ASREvent, ASRHandler
-from .bus import event_bus
+from .bus import event_bus, EventBus
+from .journal import EventJournal, read_journal, replay_journal
 
 __all__ = [
     "BaseEvent",
@@ -9,4 +10,8 @@ __all__ = [
     "ASREvent",
     "ASRHandler",
     "event_bus",
+    "EventBus",
+    "EventJournal",
+    "read_journal",
+    "replay_journal",
 ]
@@ -1,17 +1,34 @@
-from typing import Callable, Type, Awaitable
+from typing import Callable, Optional, Type, Awaitable
 from .event import BaseEvent
+from ..utils.profiling import profiler
 
 import logging
 
 logger = logging.getLogger(__name__)
 
+Handler = Callable[[BaseEvent], Awaitable[None]]
+Tap = Callable[[BaseEvent], None]
+DoneTap = Callable[[BaseEvent, Optional[BaseException]], None]
+
 
 class EventBus:
+    """
+    事件总线
+
+    处理器按事件类的 MRO 解析：订阅某个事件类型的处理器同时会收到它所有子类的事件，
+    订阅 `BaseEvent` 即可收到全部事件。分发顺序为从具体类型到基类，同一类型内按订阅顺序。
+    每个具体事件类型的处理器列表在首次发布时计算并缓存，订阅变化时缓存失效。
+    """
+
     def __init__(self):
-        # 存储事件类型与其对应的处理器列表
-        self._subscribers: dict[
-            Type[BaseEvent], list[Callable[[BaseEvent], Awaitable[None]]]
-        ] = {}
+        # 存储事件类型与其对应的处理器，dict 保持订阅顺序且可以 O(1) 删除
+        self._subscribers: dict[Type[BaseEvent], dict[Handler, None]] = {}
+        # 具体事件类型 -> 沿 MRO 解析后的处理器
+        self._dispatch_cache: dict[Type[BaseEvent], tuple[Handler, ...]] = {}
+        # 在分发前同步观察每个发布的事件，例如事件日志
+        self._taps: list[Tap] = []
+        # 在所有处理器执行完后同步观察每个事件，处理器抛出异常时同样会被调用
+        self._done_taps: list[DoneTap] = []
 
     def subscribe(
         self,
@@ -19,32 +36,105 @@ class EventBus:
         handler: Callable[[BaseEvent], Awaitable[None]],
     ):
         """订阅一个事件"""
-        if event_type not in self._subscribers:
-            self._subscribers[event_type] = []
-        self._subscribers[event_type].append(handler)
+        self._subscribers.setdefault(event_type, {})[handler] = None
+        self._dispatch_cache.clear()
         logger.info(f"订阅事件: {event_type.__name__}")
 
+    def subscribe_all(self, handler: Callable[[BaseEvent], Awaitable[None]]):
+        """订阅所有事件"""
+        self.subscribe(BaseEvent, handler)
+
     def unsubscribe(
         self,
         event_type: Type[BaseEvent],
         handler: Callable[[BaseEvent], Awaitable[None]],
     ):
         """取消订阅一个事件处理器"""
-        if event_type in self._subscribers:
-            try:
-                self._subscribers[event_type].remove(handler)
-                logger.info(f"取消订阅事件: {event_type.__name__}")
-            except ValueError:
-                logger.warning(
-                    f"处理器未找到: {handler}，无法取消订阅 {event_type.__name__}"
-                )
+        handlers = self._subscribers.get(event_type)
+        if handlers is None:
+            return
+        try:
+            del handlers[handler]
+        except KeyError:
+            logger.warning(
+                f"处理器未找到: {handler}，无法取消订阅 {event_type.__name__}"
+            )
+            return
+        if not handlers:
+            del self._subscribers[event_type]
+        self._dispatch_cache.clear()
+        logger.info(f"取消订阅事件: {event_type.__name__}")
+
+    def add_tap(self, tap: Callable[[BaseEvent], None]):
+        """添加一个观察者，它会在处理器执行前同步收到每个发布的事件"""
+        self._taps.append(tap)
+
+    def remove_tap(self, tap: Callable[[BaseEvent], None]):
+        """移除观察者"""
+        try:
+            self._taps.remove(tap)
+        except ValueError:
+            logger.warning(f"观察者未找到: {tap}")
+
+    def add_done_tap(self, tap: DoneTap):
+        """
+        添加一个完成观察者，它会在事件的所有处理器执行完后同步收到事件，
+        第二个参数为处理器抛出的异常，正常完成时为 None
+        """
+        self._done_taps.append(tap)
+
+    def remove_done_tap(self, tap: DoneTap):
+        """移除完成观察者"""
+        try:
+            self._done_taps.remove(tap)
+        except ValueError:
+            logger.warning(f"完成观察者未找到: {tap}")
+
+    def handlers_for(self, event_type: Type[BaseEvent]) -> tuple[Handler, ...]:
+        """返回某个事件类型会被分发到的处理器"""
+        handlers = self._dispatch_cache.get(event_type)
+        if handlers is None:
+            resolved: dict[Handler, None] = {}
+            for cls in event_type.__mro__:
+                subscribed = self._subscribers.get(cls)  # type: ignore[arg-type]
+                if subscribed:
+                    resolved.update(subscribed)
+            handlers = tuple(resolved)
+            self._dispatch_cache[event_type] = handlers
+        return handlers
 
     async def publish(self, event: BaseEvent):
         """发布一个事件"""
         event_type = type(event)
-        if event_type in self._subscribers:
-            for handler in self._subscribers[event_type]:
-                await handler(event)
+        for tap in self._taps:
+            try:
+                tap(event)
+            except Exception as e:
+                logger.error(f"事件观察者执行失败: {e}")
+        error: Optional[BaseException] = None
+        try:
+            for handler in self.handlers_for(event_type):
+                if profiler.enabled:
+                    name = getattr(handler, "__qualname__", repr(handler))
+                    code = getattr(handler, "__code__", None)
+                    with profiler.stage(
+                        f"{event_type.__name__}:{name}",
+                        getattr(event, "session_id", ""),
+                        sync=False,
+                        alloc_filename=code.co_filename if code else None,
+                    ):
+                        await handler(event)
+                else:
+                    await handler(event)
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            for done_tap in self._done_taps:
+                try:
+                    done_tap(event, error)
+                except Exception as tap_error:
+                    logger.error(f"事件完成观察者执行失败: {tap_error}")
         logger.info(f"发布事件: {event_type.__name__}")
 
 
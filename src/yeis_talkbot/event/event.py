@@ -17,6 +17,8 @@ class BaseEvent(BaseModel):
 class TTSEvent(BaseEvent):
     text: str = ""
     audio_path: str = ""
+    session_id: str = ""
+    priority: int = 0
     status: Literal["pending", "processing", "completed", "failed"] = "pending"
 
 
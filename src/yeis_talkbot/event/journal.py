@@ -0,0 +1,323 @@
+"""
+事件日志与回放
+
+日志文件格式（追加写入，大端序）:
+
+    文件头  : b"YTJ1"
+    每条记录: u32 元数据长度 | u32 音频长度 | 元数据 JSON (utf-8) | 音频字节
+
+元数据 JSON 为 {"t": 相对开始录制的秒数, "type": 事件类名, "data": 事件字段,
+"ext": 音频扩展名, "phase": "publish" 或 "done"}。
+事件在发布时记录一次（phase 为 publish）；TTSEvent 处理完成、生成了音频后再记录一次
+（phase 为 done），因此合成的音频也会被保存。事件引用的音频文件会原样写入记录中。
+回放时只重新发布 publish 记录。
+
+命令行:
+    python -m src.yeis_talkbot.event.journal events.ytj
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from .bus import EventBus, event_bus
+from .event import ASREvent, BaseEvent, TTSEvent
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"YTJ1"
+RECORD_HEADER = struct.Struct(">II")
+
+Phase = Literal["publish", "done"]
+
+
+@dataclass
+class JournalRecord:
+    """日志中的一条事件记录"""
+
+    t: float
+    event_type: str
+    data: Dict[str, Any]
+    audio: bytes = b""
+    audio_ext: str = ""
+    phase: Phase = "publish"
+
+
+def _event_types() -> Dict[str, Type[BaseEvent]]:
+    """收集所有已定义的事件类型"""
+    types: Dict[str, Type[BaseEvent]] = {}
+    pending: List[Type[BaseEvent]] = [BaseEvent]
+    while pending:
+        cls = pending.pop()
+        types[cls.__name__] = cls
+        pending.extend(cls.__subclasses__())
+    return types
+
+
+def _read_audio(path: str) -> bytes:
+    if not path or not os.path.isfile(path):
+        return b""
+    with open(path, "rb") as f:
+        return f.read()
+
+
+class EventJournal:
+    """
+    事件日志写入器
+
+    挂到事件总线后，每个发布的事件在处理器执行前被记录，因此记录的是事件发布时的状态；
+    TTSEvent 处理完成后带着合成的音频再记录一次。
+    事件在发布时同步序列化，读取音频和写文件在后台线程中进行，不阻塞事件循环。
+
+    example usage:
+    ==============
+    with EventJournal("tmp/events.ytj").attach(event_bus):
+        ...  # 正常运行
+    """
+
+    def __init__(
+        self,
+        path: str,
+        audio_reader: Callable[[str], bytes] = _read_audio,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Args:
+            path (str): 日志文件路径，已存在时追加写入
+            audio_reader (Callable[[str], bytes]): 根据 audio_path 读取音频数据，在写入线程中调用
+            clock (Callable[[], float]): 单调时钟
+        """
+        self.path = path
+        self.audio_reader = audio_reader
+        self.clock = clock
+        self.records = 0
+        self._bus: Optional[EventBus] = None
+        self._start = clock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file: Optional[BinaryIO] = open(path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+        # (元数据, 音频路径)，None 表示结束
+        self._queue: "queue.SimpleQueue[Optional[Tuple[bytes, str]]]" = (
+            queue.SimpleQueue()
+        )
+        self._writer = threading.Thread(
+            target=self._write_loop, name="event-journal", daemon=True
+        )
+        self._writer.start()
+
+    def record(self, event: BaseEvent, phase: Phase = "publish") -> None:
+        """记录一个事件，事件内容立即序列化，写入在后台线程中完成"""
+        if self._file is None:
+            return
+        audio_path = ""
+        if isinstance(event, (ASREvent, TTSEvent)):
+            audio_path = event.audio_path
+
+        meta = json.dumps(
+            {
+                "t": self.clock() - self._start,
+                "type": type(event).__name__,
+                "data": event.model_dump(mode="json"),
+                "ext": os.path.splitext(audio_path)[1] if audio_path else "",
+                "phase": phase,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self._queue.put((meta, audio_path))
+        self.records += 1
+
+    def _on_done(self, event: BaseEvent, error: Optional[BaseException]) -> None:
+        if isinstance(event, TTSEvent) and event.audio_path:
+            self.record(event, phase="done")
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            meta, audio_path = item
+            assert self._file is not None
+            try:
+                audio = self.audio_reader(audio_path) if audio_path else b""
+                self._file.write(RECORD_HEADER.pack(len(meta), len(audio)))
+                self._file.write(meta)
+                self._file.write(audio)
+            except Exception as e:
+                logger.error(f"写入事件日志失败: {e}")
+
+    def attach(self, bus: EventBus = event_bus) -> "EventJournal":
+        """开始记录总线上发布的事件"""
+        self._bus = bus
+        bus.add_tap(self.record)
+        bus.add_done_tap(self._on_done)
+        logger.info(f"事件日志已开启: {self.path}")
+        return self
+
+    def close(self) -> None:
+        """停止记录，等待已记录的事件写入后关闭文件"""
+        if self._bus is not None:
+            self._bus.remove_tap(self.record)
+            self._bus.remove_done_tap(self._on_done)
+            self._bus = None
+        if self._file is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._file.close()
+            self._file = None
+            logger.info(f"事件日志已关闭: {self.path}, 共 {self.records} 条记录")
+
+    def __enter__(self) -> "EventJournal":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def read_journal(path: str) -> Iterator[JournalRecord]:
+    """
+    逐条读取日志记录
+
+    文件末尾不完整的记录（例如进程崩溃时写了一半）会被忽略。
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not an event journal: {path}")
+        while True:
+            header = f.read(RECORD_HEADER.size)
+            if len(header) < RECORD_HEADER.size:
+                return
+            meta_len, audio_len = RECORD_HEADER.unpack(header)
+            meta = f.read(meta_len)
+            audio = f.read(audio_len)
+            if len(meta) < meta_len or len(audio) < audio_len:
+                logger.warning(f"事件日志末尾记录不完整: {path}")
+                return
+            obj = json.loads(meta)
+            yield JournalRecord(
+                t=obj["t"],
+                event_type=obj["type"],
+                data=obj["data"],
+                audio=audio,
+                audio_ext=obj.get("ext", ""),
+                phase=obj.get("phase", "publish"),
+            )
+
+
+def _restore_event(
+    record: JournalRecord, types: Dict[str, Type[BaseEvent]], audio_dir: str
+) -> Optional[BaseEvent]:
+    cls = types.get(record.event_type)
+    if cls is None:
+        logger.warning(f"未知事件类型，跳过: {record.event_type}")
+        return None
+    data = dict(record.data)
+    data.pop("event_name", None)
+    if record.audio:
+        audio_path = os.path.join(
+            audio_dir, f"{data.get('event_id', 'event')}{record.audio_ext}"
+        )
+        with open(audio_path, "wb") as f:
+            f.write(record.audio)
+        data["audio_path"] = audio_path
+    return cls(**data)
+
+
+async def replay_journal(
+    path: str,
+    bus: EventBus = event_bus,
+    speed: float = 1.0,
+    audio_dir: str = "tmp/replay/",
+) -> List[BaseEvent]:
+    """
+    将日志中的事件按原始节奏重新发布到总线
+
+    每个事件在其记录时间点（除以 speed）作为独立任务发布，
+    因此并发会话的事件会像线上一样相互交错。
+
+    Args:
+        path (str): 日志文件路径
+        bus (EventBus): 目标事件总线
+        speed (float): 回放倍速，<= 0 表示不等待、尽快发布
+        audio_dir (str): 还原音频文件的目录
+
+    Returns:
+        List[BaseEvent]: 回放的事件，处理器已执行完毕
+    """
+    os.makedirs(audio_dir, exist_ok=True)
+    types = _event_types()
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    events: List[BaseEvent] = []
+    tasks: List[asyncio.Task[None]] = []
+
+    for record in read_journal(path):
+        if record.phase != "publish":
+            continue
+        event = _restore_event(record, types, audio_dir)
+        if event is None:
+            continue
+        if speed > 0:
+            delay = start + record.t / speed - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        events.append(event)
+        tasks.append(asyncio.create_task(bus.publish(event)))
+
+    await asyncio.gather(*tasks)
+    logger.info(f"回放完成: {path}, 共 {len(events)} 个事件")
+    return events
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """打印日志摘要"""
+    parser = argparse.ArgumentParser(description="Inspect an event journal")
+    parser.add_argument("path", help="journal file")
+    args = parser.parse_args(argv)
+
+    counts: Counter[str] = Counter()
+    audio_bytes = 0
+    duration = 0.0
+    for record in read_journal(args.path):
+        key = record.event_type
+        if record.phase != "publish":
+            key = f"{key} ({record.phase})"
+        counts[key] += 1
+        audio_bytes += len(record.audio)
+        duration = record.t
+
+    print(f"records: {sum(counts.values())}")
+    print(f"duration: {duration:.3f}s")
+    print(f"audio bytes: {audio_bytes}")
+    for event_type, count in counts.most_common():
+        print(f"  {event_type}: {count}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+from .history import ChatMessage, ConversationHistory, estimate_tokens
+from .session import (
+    HistoryStore,
+    SessionMemoryManager,
+    SessionState,
+    SessionStats,
+    deep_sizeof,
+)
+
+__all__ = [
+    "ChatMessage",
+    "ConversationHistory",
+    "HistoryStore",
+    "SessionMemoryManager",
+    "SessionState",
+    "SessionStats",
+    "deep_sizeof",
+    "estimate_tokens",
+]
@@ -0,0 +1,206 @@
+from collections import deque
+from typing import Callable, Deque, List, Literal, Optional, Tuple
+import logging
+import math
+
+from pydantic import BaseModel, ConfigDict
+
+logger = logging.getLogger(__name__)
+
+Role = Literal["system", "user", "assistant"]
+
+TokenCounter = Callable[[str], int]
+"""文本 -> token 数。可以替换为 tiktoken 等真实分词器"""
+
+Summarizer = Callable[[str, List["ChatMessage"]], str]
+"""(已有摘要, 被移出的消息) -> 新摘要"""
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    粗略估算文本的 token 数。
+
+    中日韩字符按每字 1 个 token 计算，其余字符按每 4 个字符 1 个 token 计算。
+    """
+    cjk = sum(
+        1 for ch in text if "\u2e80" <= ch <= "\u9fff" or "\uac00" <= ch <= "\ud7af"
+    )
+    return cjk + math.ceil((len(text) - cjk) / 4)
+
+
+class ChatMessage(BaseModel):
+    """
+    单条对话消息，token 数在创建时计算一次并随消息保存。
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    role: Role
+    content: str
+    tokens: int
+
+
+class ConversationHistory:
+    """
+    单个会话的对话历史。
+
+    消息按时间顺序保存在一个有界队列中，超出 `max_messages` 的旧消息
+    会被交给 `summarizer` 折叠进摘要；未配置 `summarizer` 时直接丢弃。
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        token_counter: TokenCounter = estimate_tokens,
+        max_messages: int = 64,
+        summarizer: Optional[Summarizer] = None,
+        system_prompt: str = "",
+    ) -> None:
+        self.session_id = session_id
+        self.token_counter = token_counter
+        self.max_messages = max_messages
+        self.summarizer = summarizer
+        self.messages: Deque[ChatMessage] = deque()
+        self.total_tokens = 0
+        self.system_prompt: Optional[ChatMessage] = None
+        self.summary: Optional[ChatMessage] = None
+        if system_prompt:
+            self.set_system_prompt(system_prompt)
+
+    def _make(self, role: Role, content: str) -> ChatMessage:
+        return ChatMessage(
+            role=role, content=content, tokens=self.token_counter(content)
+        )
+
+    def set_system_prompt(self, content: str) -> None:
+        """设置系统提示词，系统提示词始终位于上下文开头"""
+        self.system_prompt = self._make("system", content) if content else None
+
+    def add(self, role: Role, content: str) -> ChatMessage:
+        """
+        追加一条消息
+
+        Args:
+            role (Role): 消息角色
+            content (str): 消息内容
+
+        Returns:
+            ChatMessage: 已计算 token 数的消息
+        """
+        message = self._make(role, content)
+        self.messages.append(message)
+        self.total_tokens += message.tokens
+        if len(self.messages) > self.max_messages:
+            self._compact(len(self.messages) - self.max_messages)
+        return message
+
+    def _compact(self, count: int) -> None:
+        """将最旧的 count 条消息移出历史，并折叠进摘要"""
+        removed: List[ChatMessage] = []
+        for _ in range(min(count, len(self.messages))):
+            message = self.messages.popleft()
+            self.total_tokens -= message.tokens
+            removed.append(message)
+        if not removed or self.summarizer is None:
+            return
+
+        previous = self.summary.content if self.summary else ""
+        try:
+            summary = self.summarizer(previous, removed)
+        except Exception as e:
+            logger.error(f"会话 {self.session_id} 生成摘要失败: {e}")
+            return
+        self.summary = self._make("system", summary) if summary else None
+
+    def _truncate(self, message: ChatMessage, budget: int) -> ChatMessage:
+        """保留消息末尾不超过 budget 个 token 的内容"""
+        content = message.content
+        low, high = 0, len(content)
+        # 二分查找能放下的最长后缀
+        while low < high:
+            mid = (low + high + 1) // 2
+            if self.token_counter(content[len(content) - mid :]) <= budget:
+                low = mid
+            else:
+                high = mid - 1
+        logger.warning(
+            f"会话 {self.session_id} 最新的用户消息超出预算，截断为 {low}/{len(content)} 个字符"
+        )
+        return self._make(message.role, content[len(content) - low :])
+
+    def build_context(self, budget: int) -> List[Tuple[str, str]]:
+        """
+        在 token 预算内构建上下文
+
+        从最新的消息向前累加，放不下的旧消息只是不出现在本次上下文中，历史本身不会被修改；
+        历史的压缩只由 `max_messages` 触发。最新的一条用户消息总是会被包含，
+        单独超出预算时保留其末尾部分。摘要在最新的用户消息之后、其他消息之前预留预算，
+        放在系统提示词之后。
+
+        Args:
+            budget (int): 上下文 token 预算
+
+        Returns:
+            List[Tuple[str, str]]: (role, content) 列表，可直接传给 langchain 的聊天模型
+
+        Raises:
+            ValueError: 系统提示词本身已经超出预算
+        """
+        remaining = budget - (self.system_prompt.tokens if self.system_prompt else 0)
+        if remaining < 0 or (remaining == 0 and self.messages):
+            raise ValueError(
+                f"会话 {self.session_id} 的系统提示词超出上下文预算 {budget}"
+            )
+
+        messages = list(self.messages)
+        newest_user = next(
+            (i for i in range(len(messages) - 1, -1, -1) if messages[i].role == "user"),
+            None,
+        )
+        selected: List[ChatMessage] = []
+        if newest_user is not None:
+            # 先为最新的用户消息预留预算
+            required = messages[newest_user]
+            if required.tokens > remaining:
+                required = self._truncate(required, remaining)
+                messages[newest_user] = required
+            remaining -= required.tokens
+
+        # 摘要概括了更早的对话，优先于填充较旧的消息
+        summary = self.summary
+        if summary is not None:
+            if summary.tokens <= remaining:
+                remaining -= summary.tokens
+            else:
+                summary = None
+
+        filling = True
+        for i in range(len(messages) - 1, -1, -1):
+            message = messages[i]
+            if i == newest_user:
+                selected.append(message)
+            elif filling and message.tokens <= remaining:
+                selected.append(message)
+                remaining -= message.tokens
+            else:
+                filling = False
+                if newest_user is None or i < newest_user:
+                    break
+        selected.reverse()
+
+        context: List[Tuple[str, str]] = []
+        if self.system_prompt:
+            context.append((self.system_prompt.role, self.system_prompt.content))
+        if summary is not None:
+            context.append((summary.role, summary.content))
+        context.extend((m.role, m.content) for m in selected)
+        return context
+
+    def clear(self) -> None:
+        """清空历史和摘要，保留系统提示词"""
+        self.messages.clear()
+        self.total_tokens = 0
+        self.summary = None
+
+    def __len__(self) -> int:
+        return len(self.messages)
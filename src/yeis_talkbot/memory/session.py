@@ -0,0 +1,471 @@
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import pickle
+import sys
+import time
+
+from pydantic import BaseModel
+
+from ..configs import LLMConfig, MemoryConfig
+from ..types import audio_type
+from .history import (
+    ChatMessage,
+    ConversationHistory,
+    Role,
+    Summarizer,
+    TokenCounter,
+    estimate_tokens,
+)
+
+if TYPE_CHECKING:
+    # asr 包会导入 funasr，只在类型检查时引用
+    from ..asr import ASR
+
+logger = logging.getLogger(__name__)
+
+
+def deep_sizeof(obj: Any) -> int:
+    """
+    估算对象占用的内存字节数。
+
+    numpy 数组和 torch 张量按数据缓冲区大小计算，容器和 pydantic 模型的字段递归计算，
+    被多处引用的同一对象只计算一次。
+    """
+    seen: set[int] = set()
+    total = 0
+    stack: List[Any] = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        nbytes = getattr(item, "nbytes", None)
+        if isinstance(nbytes, int):
+            # numpy 数组 / 新版本 torch 张量
+            total += nbytes
+            continue
+        if hasattr(item, "element_size") and hasattr(item, "nelement"):
+            # torch 张量
+            total += item.element_size() * item.nelement()
+            continue
+        total += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            # 例如 ChatMessage，内容保存在实例的 __dict__ 中
+            stack.extend(item.__dict__.values())
+    return total
+
+
+class SessionStats(BaseModel):
+    """会话内存使用情况"""
+
+    hot_sessions: int
+    spilled_sessions: int
+    hot_bytes: int
+    ram_budget: int
+    spills: int
+    restores: int
+
+
+class SessionState:
+    """
+    单个会话在内存中的状态：ASR 流式缓存、已完成的识别结果和对话历史。
+
+    一句话识别结束后（`finish_utterance`），ASR 缓存会被清空，
+    识别结果只保留最近的 `max_utterances` 句。
+    """
+
+    def __init__(
+        self,
+        session_id: str,
+        history: ConversationHistory,
+        max_utterances: int = 200,
+    ) -> None:
+        self.session_id = session_id
+        self.history = history
+        self.asr_cache: Dict[str, Any] = {}
+        self.partial = ""
+        self.transcript: Deque[str] = deque(maxlen=max_utterances)
+        self.last_active = 0.0
+        self.nbytes = 0
+
+    def finish_utterance(self, text: str) -> None:
+        """一句话识别结束，保存结果并释放 ASR 缓存"""
+        text = (self.partial + text).strip()
+        if text:
+            self.transcript.append(text)
+        self.partial = ""
+        self.asr_cache = {}
+
+    def measure(self) -> int:
+        """重新计算会话占用的内存"""
+        self.nbytes = (
+            deep_sizeof(self.asr_cache)
+            + deep_sizeof(list(self.transcript))
+            + sys.getsizeof(self.partial)
+            + deep_sizeof(list(self.history.messages))
+            + (deep_sizeof(self.history.summary) if self.history.summary else 0)
+        )
+        return self.nbytes
+
+    def dump(self) -> Dict[str, Any]:
+        """导出可以序列化的状态，不包含分词器、摘要器等函数"""
+        summary = self.history.summary
+        return {
+            "session_id": self.session_id,
+            "asr_cache": self.asr_cache,
+            "partial": self.partial,
+            "transcript": list(self.transcript),
+            "messages": [m.model_dump() for m in self.history.messages],
+            "summary": summary.model_dump() if summary else None,
+            "last_active": self.last_active,
+        }
+
+    def load(self, data: Dict[str, Any]) -> None:
+        """从 `dump` 的结果恢复状态"""
+        self.asr_cache = data["asr_cache"]
+        self.partial = data["partial"]
+        self.transcript.extend(data["transcript"])
+        self.history.clear()
+        for message in data["messages"]:
+            message = ChatMessage(**message)
+            self.history.messages.append(message)
+            self.history.total_tokens += message.tokens
+        if data["summary"]:
+            self.history.summary = ChatMessage(**data["summary"])
+        self.last_active = data["last_active"]
+
+
+class SessionMemoryManager:
+    """
+    在固定内存预算内管理大量会话的状态。
+
+    每次访问后重新计算会话占用的内存；总量超过 `ram_budget` 时，
+    最久未活动的会话会被序列化到 `spill_dir` 并从内存中移除，
+    超过 `spill_after` 未活动的会话也会被转出。再次访问时自动从磁盘恢复。
+    超过 `session_ttl` 未活动或超过 `max_sessions` 的会话（包括已转出的）会被删除。
+
+    会话的对话历史也由这里管理，`HistoryStore` 只是它的一个视图。
+
+    example usage:
+    ==============
+    sessions = SessionMemoryManager(app_config.Memory)
+    text = sessions.transcribe("session-1", asr, chunk)
+    sessions.get("session-1").history.add("user", text)
+    sessions.touch("session-1")
+    """
+
+    def __init__(
+        self,
+        memory_config: Optional[MemoryConfig] = None,
+        token_counter: TokenCounter = estimate_tokens,
+        summarizer: Optional[Summarizer] = None,
+        system_prompt: str = "",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.memory_config = memory_config or MemoryConfig()
+        self.token_counter = token_counter
+        self.summarizer = summarizer
+        self.system_prompt = system_prompt
+        self.clock = clock
+        self.spill_dir = Path(self.memory_config.spill_dir)
+        # 内存中的会话，按最后活动时间从旧到新排列
+        self._hot: OrderedDict[str, SessionState] = OrderedDict()
+        # 已转出的会话 -> 最后活动时间
+        self._spilled: Dict[str, float] = {}
+        self.hot_bytes = 0
+        self.spills = 0
+        self.restores = 0
+
+    def _new_state(self, session_id: str) -> SessionState:
+        history = ConversationHistory(
+            session_id,
+            token_counter=self.token_counter,
+            max_messages=self.memory_config.max_messages,
+            summarizer=self.summarizer,
+            system_prompt=self.system_prompt,
+        )
+        return SessionState(session_id, history, self.memory_config.max_utterances)
+
+    def _spill_path(self, session_id: str) -> Path:
+        name = hashlib.sha1(session_id.encode("utf-8")).hexdigest()
+        return self.spill_dir / f"{name}.pkl"
+
+    def get(self, session_id: str) -> SessionState:
+        """
+        获取会话状态并刷新活动时间，不存在时创建，已转出时从磁盘恢复
+
+        `_hot` 按最后活动时间排序，调整顺序时必须同时更新 `last_active`
+        """
+        state = self._hot.get(session_id)
+        if state is not None:
+            state.last_active = self.clock()
+            self._hot.move_to_end(session_id)
+            return state
+
+        state = self._new_state(session_id)
+        if session_id in self._spilled:
+            self._restore(state)
+        state.last_active = self.clock()
+        self._hot[session_id] = state
+        self.hot_bytes += state.measure()
+        while len(self) > max(self.memory_config.max_sessions, 1):
+            self._evict_oldest()
+        self.enforce_budget()
+        return state
+
+    def _evict_oldest(self) -> None:
+        # 转出的会话总是比内存中的会话更久未活动
+        if self._spilled:
+            oldest = min(self._spilled, key=self._spilled.__getitem__)
+        else:
+            oldest = next(iter(self._hot))
+        logger.info(f"会话数超出上限，淘汰会话: {oldest}")
+        self.remove(oldest)
+
+    def touch(self, session_id: str) -> int:
+        """
+        会话状态被修改后调用，刷新活动时间并重新计算内存占用
+
+        Returns:
+            int: 会话当前占用的字节数
+        """
+        state = self.get(session_id)
+        self.hot_bytes -= state.nbytes
+        self.hot_bytes += state.measure()
+        self.enforce_budget()
+        return state.nbytes
+
+    def transcribe(
+        self,
+        session_id: str,
+        asr: "ASR",
+        chunk: Optional[audio_type],
+        is_final: bool = False,
+        chunk_size: Optional[List[int]] = None,
+    ) -> str:
+        """
+        使用会话自己的 ASR 缓存进行流式识别
+
+        ASR 实例可以在多个会话之间共享，识别前后交换 `asr.cache`。
+        `is_final` 为 True 时这句话结束，结果写入会话的识别记录并释放 ASR 缓存。
+        `chunk_size` 为会话的流式参数，见 `ConfigService.session_config`。
+        """
+        state = self.get(session_id)
+        asr.cache = state.asr_cache  # type: ignore[attr-defined]
+        try:
+            text = asr.transcribe(chunk, is_final=is_final, chunk_size=chunk_size)
+        finally:
+            state.asr_cache = asr.cache  # type: ignore[attr-defined]
+            asr.cache = {}  # type: ignore[attr-defined]
+        if is_final:
+            state.finish_utterance(text)
+        else:
+            state.partial += text
+        self.touch(session_id)
+        return text
+
+    def spill(self, session_id: str) -> bool:
+        """
+        将会话状态写入磁盘并从内存中移除
+
+        Returns:
+            bool: 是否成功转出
+        """
+        state = self._hot.get(session_id)
+        if state is None:
+            return False
+        path = self._spill_path(session_id)
+        try:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(state.dump(), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.error(f"会话 {session_id} 转出失败: {e}")
+            return False
+
+        del self._hot[session_id]
+        self.hot_bytes -= state.nbytes
+        self._spilled[session_id] = state.last_active
+        self.spills += 1
+        logger.debug(f"会话 {session_id} 已转出到磁盘，释放 {state.nbytes} 字节")
+        return True
+
+    def _restore(self, state: SessionState) -> None:
+        path = self._spill_path(state.session_id)
+        del self._spilled[state.session_id]
+        try:
+            with open(path, "rb") as f:
+                state.load(pickle.load(f))
+            path.unlink()
+        except Exception as e:
+            logger.error(f"会话 {state.session_id} 恢复失败，使用空状态: {e}")
+            return
+        self.restores += 1
+
+    def enforce_budget(self) -> int:
+        """
+        内存超出预算时转出最久未活动的会话，最近访问的会话始终保留在内存中
+
+        Returns:
+            int: 转出的会话数
+        """
+        spilled = 0
+        while self.hot_bytes > self.memory_config.ram_budget and len(self._hot) > 1:
+            oldest = next(iter(self._hot))
+            if not self.spill(oldest):
+                break
+            spilled += 1
+        return spilled
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """
+        删除超过 `session_ttl` 未活动的会话，包括已转出的
+
+        Returns:
+            int: 删除的会话数
+        """
+        now = self.clock() if now is None else now
+        deadline = now - self.memory_config.session_ttl
+        expired = [s for s, t in self._spilled.items() if t <= deadline]
+        for session_id, state in self._hot.items():
+            if state.last_active > deadline:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            self.remove(session_id)
+        if expired:
+            logger.info(f"淘汰 {len(expired)} 个空闲会话")
+        return len(expired)
+
+    def spill_idle(self, now: Optional[float] = None) -> int:
+        """
+        删除超过 `session_ttl` 未活动的会话，转出超过 `spill_after` 未活动的会话
+
+        Returns:
+            int: 转出的会话数
+        """
+        now = self.clock() if now is None else now
+        self.expire(now)
+
+        deadline = now - self.memory_config.spill_after
+        spilled = 0
+        while self._hot:
+            session_id, state = next(iter(self._hot.items()))
+            if state.last_active > deadline or not self.spill(session_id):
+                break
+            spilled += 1
+        return spilled
+
+    def remove(self, session_id: str) -> None:
+        """删除会话，包括已转出到磁盘的状态"""
+        state = self._hot.pop(session_id, None)
+        if state is not None:
+            self.hot_bytes -= state.nbytes
+        if self._spilled.pop(session_id, None) is not None:
+            self._spill_path(session_id).unlink(missing_ok=True)
+
+    def stats(self) -> SessionStats:
+        return SessionStats(
+            hot_sessions=len(self._hot),
+            spilled_sessions=len(self._spilled),
+            hot_bytes=self.hot_bytes,
+            ram_budget=self.memory_config.ram_budget,
+            spills=self.spills,
+            restores=self.restores,
+        )
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self._hot or session_id in self._spilled
+
+    def __len__(self) -> int:
+        return len(self._hot) + len(self._spilled)
+
+
+class HistoryStore:
+    """
+    按会话管理对话历史。
+
+    会话状态保存在 `SessionMemoryManager` 中，淘汰、转出和内存预算都由它负责；
+    与流式识别共用同一个 manager 时，识别结果和对话历史属于同一个会话状态。
+
+    example usage:
+    ==============
+    store = HistoryStore(app_config.LLM, app_config.Memory)
+    store.add("session-1", "user", "你好")
+    messages = store.build_context("session-1")
+    """
+
+    def __init__(
+        self,
+        llm_config: LLMConfig,
+        memory_config: Optional[MemoryConfig] = None,
+        token_counter: TokenCounter = estimate_tokens,
+        summarizer: Optional[Summarizer] = None,
+        system_prompt: str = "",
+        clock: Callable[[], float] = time.monotonic,
+        sessions: Optional[SessionMemoryManager] = None,
+    ) -> None:
+        """
+        Args:
+            sessions (SessionMemoryManager): 共用的会话管理器，指定时忽略
+                memory_config、token_counter、summarizer、system_prompt 和 clock
+        """
+        self.budget = llm_config.max_tokens
+        if sessions is None:
+            sessions = SessionMemoryManager(
+                memory_config,
+                token_counter=token_counter,
+                summarizer=summarizer,
+                system_prompt=system_prompt,
+                clock=clock,
+            )
+        self.sessions = sessions
+
+    def get(self, session_id: str) -> ConversationHistory:
+        """获取会话历史，不存在时创建，并刷新会话的活动时间"""
+        self.sessions.touch(session_id)
+        return self.sessions.get(session_id).history
+
+    def add(self, session_id: str, role: Role, content: str) -> ChatMessage:
+        """向会话追加一条消息"""
+        message = self.sessions.get(session_id).history.add(role, content)
+        self.sessions.touch(session_id)
+        return message
+
+    def build_context(
+        self, session_id: str, budget: Optional[int] = None
+    ) -> List[Tuple[str, str]]:
+        """在预算内构建会话上下文，默认预算为 `LLMConfig.max_tokens`"""
+        return self.get(session_id).build_context(
+            self.budget if budget is None else budget
+        )
+
+    def remove(self, session_id: str) -> None:
+        """移除会话"""
+        self.sessions.remove(session_id)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        淘汰超过 `session_ttl` 未活动的会话
+
+        Returns:
+            int: 被淘汰的会话数量
+        """
+        return self.sessions.expire(now)
+
+    def __contains__(self, session_id: object) -> bool:
+        return session_id in self.sessions
+
+    def __len__(self) -> int:
+        return len(self.sessions)
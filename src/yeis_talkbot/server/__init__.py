@@ -0,0 +1,8 @@
+from .admission import Admission, AdmissionController, PromptCache, serve_health
+
+__all__ = [
+    "Admission",
+    "AdmissionController",
+    "PromptCache",
+    "serve_health",
+]
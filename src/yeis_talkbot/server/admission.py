@@ -0,0 +1,285 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Literal, Optional, Set, Tuple
+
+from pydantic import BaseModel
+
+from ..configs import AdmissionConfig
+from ..event import BaseEvent, EventBus, event_bus
+from ..tts import TTS, TTSScheduler
+
+logger = logging.getLogger(__name__)
+
+Decision = Literal["accept", "degrade", "reject"]
+
+
+class Admission(BaseModel):
+    """准入结果"""
+
+    decision: Decision
+    reason: str = ""
+    fallback_audio: Optional[str] = None
+
+    @property
+    def admitted(self) -> bool:
+        return self.decision != "reject"
+
+    @property
+    def degraded(self) -> bool:
+        return self.decision == "degrade"
+
+
+class PromptCache:
+    """
+    预先合成的固定提示音，降级或拒绝时直接播放，不再占用 TTS
+
+    example usage:
+    ==============
+    prompts = PromptCache()
+    await prompts.warm(tts, {"busy": "当前线路繁忙，请稍后再拨"})
+    """
+
+    def __init__(self) -> None:
+        self._paths: Dict[str, str] = {}
+
+    async def warm(self, tts: TTS, prompts: Dict[str, str]) -> None:
+        """合成并缓存提示音"""
+        for name, text in prompts.items():
+            path = await tts.synthesize(text)
+            if path:
+                self._paths[name] = path
+            else:
+                logger.warning(f"提示音合成失败: {name}")
+
+    def put(self, name: str, path: str) -> None:
+        self._paths[name] = path
+
+    def get(self, name: str) -> Optional[str]:
+        return self._paths.get(name)
+
+
+class AdmissionController:
+    """
+    语音管道的准入控制。
+
+    跟踪当前会话数、事件总线上正在处理的事件数（以及 TTS 调度器的排队数），
+    和每个阶段（事件类型）最近的处理延迟。新会话到来时:
+
+    - 会话数达到 `max_sessions` 或排队深度达到 `max_queue_depth`: 拒绝
+    - 会话数超过 `degrade_sessions` 或任一阶段 p95 延迟超过 `latency_slo`: 降级接入，
+      会话应改用缓存的提示音而不是实时 TTS
+    - 其他情况: 正常接入
+
+    `health()` / `ready()` 提供给负载均衡的健康检查，见 `serve_health`。
+    """
+
+    def __init__(
+        self,
+        config: Optional[AdmissionConfig] = None,
+        scheduler: Optional[TTSScheduler] = None,
+        prompts: Optional[PromptCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+        stale_after: float = 60.0,
+    ) -> None:
+        """
+        Args:
+            config (AdmissionConfig): 准入阈值
+            scheduler (TTSScheduler): TTS 调度器，其排队数计入排队深度
+            prompts (PromptCache): 降级和拒绝时使用的提示音，名称为 "degraded" / "busy"
+            clock (Callable[[], float]): 单调时钟
+            stale_after (float): 超过该秒数仍未完成的事件不再计入排队深度，
+                已等待的时间作为该阶段的一次延迟记录
+        """
+        self.config = config or AdmissionConfig()
+        self.scheduler = scheduler
+        self.prompts = prompts or PromptCache()
+        self.clock = clock
+        self.stale_after = stale_after
+        self.sessions: Set[str] = set()
+        self.rejected = 0
+        self.degraded = 0
+        # event_id -> (阶段, 开始时间)
+        self._in_flight: Dict[str, Tuple[str, float]] = {}
+        self._latency: Dict[str, Deque[float]] = {}
+        self._bus: Optional[EventBus] = None
+
+    def attach(self, bus: EventBus = event_bus) -> "AdmissionController":
+        """开始从事件总线采集排队深度和延迟"""
+        self._bus = bus
+        bus.add_tap(self._on_publish)
+        bus.add_done_tap(self._on_done)
+        return self
+
+    def detach(self) -> None:
+        if self._bus is not None:
+            self._bus.remove_tap(self._on_publish)
+            self._bus.remove_done_tap(self._on_done)
+            self._bus = None
+
+    def _on_publish(self, event: BaseEvent) -> None:
+        self._in_flight[event.event_id] = (type(event).__name__, self.clock())
+
+    def _on_done(self, event: BaseEvent, error: Optional[BaseException]) -> None:
+        # 处理器抛出异常时同样会被调用，事件不会滞留在排队深度中
+        entry = self._in_flight.pop(event.event_id, None)
+        if entry is None:
+            return
+        stage, started = entry
+        self.record_latency(stage, self.clock() - started)
+
+    def record_latency(self, stage: str, seconds: float) -> None:
+        """记录某个阶段的一次处理延迟"""
+        window = self._latency.get(stage)
+        if window is None:
+            window = self._latency[stage] = deque(maxlen=self.config.latency_window)
+        window.append(seconds)
+
+    def latency_p95(self) -> Dict[str, float]:
+        """每个阶段最近的 p95 延迟"""
+        result: Dict[str, float] = {}
+        for stage, window in self._latency.items():
+            if window:
+                ordered = sorted(window)
+                result[stage] = ordered[math.ceil(0.95 * len(ordered)) - 1]
+        return result
+
+    def queue_depth(self) -> int:
+        """正在处理的事件数加上 TTS 调度器的排队数"""
+        now = self.clock()
+        deadline = now - self.stale_after
+        stale = [k for k, (_, t) in self._in_flight.items() if t < deadline]
+        for key in stale:
+            # 卡住的阶段同样要计入延迟，否则最慢的事件永远不会触发降级
+            stage, started = self._in_flight.pop(key)
+            logger.warning(f"{stage} 事件 {key} 超过 {self.stale_after}s 仍未完成")
+            self.record_latency(stage, now - started)
+        depth = len(self._in_flight)
+        if self.scheduler is not None:
+            depth += sum(s["queued"] for s in self.scheduler.stats().values())
+        return depth
+
+    def evaluate(self) -> Admission:
+        """根据当前负载判断新会话的准入结果，不修改状态"""
+        sessions = len(self.sessions)
+        depth = self.queue_depth()
+        if sessions >= self.config.max_sessions:
+            return Admission(
+                decision="reject",
+                reason=f"sessions {sessions} >= {self.config.max_sessions}",
+                fallback_audio=self.prompts.get("busy"),
+            )
+        if depth >= self.config.max_queue_depth:
+            return Admission(
+                decision="reject",
+                reason=f"queue depth {depth} >= {self.config.max_queue_depth}",
+                fallback_audio=self.prompts.get("busy"),
+            )
+        if sessions >= self.config.degrade_sessions:
+            return Admission(
+                decision="degrade",
+                reason=f"sessions {sessions} >= {self.config.degrade_sessions}",
+                fallback_audio=self.prompts.get("degraded"),
+            )
+        for stage, p95 in self.latency_p95().items():
+            if p95 > self.config.latency_slo:
+                return Admission(
+                    decision="degrade",
+                    reason=f"{stage} p95 {p95:.3f}s > {self.config.latency_slo}s",
+                    fallback_audio=self.prompts.get("degraded"),
+                )
+        return Admission(decision="accept")
+
+    def admit(self, session_id: str) -> Admission:
+        """
+        为新会话申请准入，接入（包括降级接入）的会话需要在结束时调用 `release`
+        """
+        if session_id in self.sessions:
+            return Admission(decision="accept", reason="already admitted")
+        admission = self.evaluate()
+        if admission.decision == "reject":
+            self.rejected += 1
+            logger.warning(f"拒绝会话 {session_id}: {admission.reason}")
+            return admission
+        if admission.decision == "degrade":
+            self.degraded += 1
+            logger.warning(f"降级接入会话 {session_id}: {admission.reason}")
+        self.sessions.add(session_id)
+        return admission
+
+    def release(self, session_id: str) -> None:
+        """会话结束"""
+        self.sessions.discard(session_id)
+
+    def ready(self) -> bool:
+        """是否可以接收新会话"""
+        return self.evaluate().admitted
+
+    def health(self) -> Dict[str, Any]:
+        """当前负载状态"""
+        admission = self.evaluate()
+        return {
+            "status": admission.decision,
+            "reason": admission.reason,
+            "sessions": len(self.sessions),
+            "queue_depth": self.queue_depth(),
+            "latency_p95": self.latency_p95(),
+            "rejected": self.rejected,
+            "degraded": self.degraded,
+        }
+
+
+async def _handle_health_request(
+    controller: AdmissionController,
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+) -> None:
+    try:
+        request_line = await reader.readline()
+        # 丢弃请求头
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        path = parts[1] if len(parts) > 1 else "/"
+
+        if path == "/healthz":
+            status, body = 200, controller.health()
+        elif path == "/readyz":
+            ready = controller.ready()
+            status, body = (200 if ready else 503), {"ready": ready}
+        else:
+            status, body = 404, {"error": "not found"}
+
+        payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+        writer.write(
+            f"HTTP/1.1 {status} {reason}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: close\r\n\r\n".encode("latin-1")
+            + payload
+        )
+        await writer.drain()
+    except Exception as e:
+        logger.error(f"健康检查请求处理失败: {e}")
+    finally:
+        writer.close()
+
+
+async def serve_health(
+    controller: AdmissionController, host: str = "0.0.0.0", port: int = 8081
+) -> asyncio.AbstractServer:
+    """
+    启动健康检查 HTTP 服务
+
+    - GET /healthz: 始终返回 200 和当前负载状态（存活检查）
+    - GET /readyz: 可以接收新会话时返回 200，否则返回 503（就绪检查）
+    """
+    server = await asyncio.start_server(
+        lambda r, w: _handle_health_request(controller, r, w), host, port
+    )
+    logger.info(f"健康检查服务已启动: {host}:{port}")
+    return server
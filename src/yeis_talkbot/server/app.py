@@ -1,3 +1,29 @@
-from ..configs import AppConfig
+from ..configs import AppConfig, ConfigService, ConfigSnapshot
+from ..tts import EdgeTTS
 
-app_config = AppConfig.from_yaml("configs/config.yaml")
+# 配置只解析一次并缓存，config_service.start() 之后文件变化会自动生效
+config_service = ConfigService("configs/config.yaml")
+
+# 启动时的配置快照；需要感知热更新的代码应读取 config_service.snapshot
+app_config: AppConfig = config_service.snapshot.app
+
+# 服务使用的 TTS 实例，edge-tts 配置变化时自动切换
+tts = EdgeTTS(app_config, config=config_service.snapshot.edge_tts)
+
+
+def _apply_config(snapshot: ConfigSnapshot) -> None:
+    tts.apply_config(snapshot.edge_tts)
+
+
+config_service.subscribe(_apply_config)
+
+
+async def startup() -> None:
+    """服务启动时调用，开始监视配置文件"""
+    await config_service.start()
+
+
+async def shutdown() -> None:
+    """服务退出时调用，停止监视配置文件并清理 TTS 输出"""
+    await config_service.stop()
+    await tts.store.stop()
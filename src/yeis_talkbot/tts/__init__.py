@@ -1,11 +1,29 @@
 from .tts_handler import register_tts_handler, unregister_tts_handler
 from .edge_tts import EdgeTTS, EdgeTTSHandler
+from .index_tts import IndexTTS, IndexTTSHandler
 from .abc import TTS
+from .encoding import AudioEncoder
+from .output_store import OutputStore, OutputStoreStats
+from .scheduler import (
+    TTSScheduler,
+    TTSSchedulerHandler,
+    register_tts_scheduler_handler,
+    unregister_tts_scheduler_handler,
+)
 
 __all__ = [
     "TTS",
+    "AudioEncoder",
+    "OutputStore",
+    "OutputStoreStats",
+    "TTSScheduler",
+    "TTSSchedulerHandler",
+    "register_tts_scheduler_handler",
+    "unregister_tts_scheduler_handler",
     "EdgeTTS",
     "EdgeTTSHandler",
+    "IndexTTS",
+    "IndexTTSHandler",
     "register_tts_handler",
     "unregister_tts_handler",
 ]
@@ -1,9 +1,12 @@
 from ..event import BaseEvent, event_bus, TTSEvent, TTSHandler
+from ..configs import ConfigService
+from ..utils.profiling import profiler
 from .abc import TTS
+from .encoding import AudioEncoder
+from .output_store import OutputStore
 
 import logging
-from typing import Any
-import os
+from typing import Any, AsyncIterator, Optional
 import time
 import uuid
 
@@ -20,47 +23,118 @@ class EdgeTTS(TTS):
     from ..configs.configs import AppConfig
     import edge_tts
 
-    def __init__(self, app_config: AppConfig) -> None:
+    def __init__(
+        self,
+        app_config: AppConfig,
+        store: Optional[OutputStore] = None,
+        config: Optional[EdgeTTSConfig] = None,
+    ) -> None:
         """
         Initialize the EdgeTTS instance with configuration settings.
+
+        :param store: Output store for synthesized audio, defaults to the
+            store shared by all backends writing to `app_config.TTS.out_path`.
+        :param config: Edge TTS settings, loaded from the file referenced by
+            `app_config.TTS.edge_tts` when not given.
         """
-        self.config = self.EdgeTTSConfig.from_yaml(app_config.TTS.edge_tts["config"])
-        self.voice = self.config.voice
-        self.rate = self.config.rate
-        self.volume = self.config.volume
+        self.apply_config(
+            config or self.EdgeTTSConfig.from_yaml(app_config.TTS.edge_tts["config"])
+        )
         self.output_path = app_config.TTS.out_path
         if self.output_path == "":
             self.output_path = "tmp/tts/"
-        if os.path.exists(self.output_path) is False:
-            os.makedirs(self.output_path)
+        self.store = store or OutputStore.shared(app_config.TTS)
 
-    async def synthesize(self, text: str, **kwargs: str) -> Any:
+    def apply_config(self, config: EdgeTTSConfig) -> None:
         """
-        Synthesize text to audio using Edge TTS.
+        Switch to new Edge TTS settings, e.g. after a config reload.
 
-        :param text: Text to be synthesized.
-        :param kwargs: Additional parameters for synthesis.
-        :return: Synthesized audio output.
+        :param config: New Edge TTS settings.
         """
-
-        logger.info(
-            f"合成音频: {text} voice: {self.voice}, rate: {self.rate}, volume: {self.volume}"
+        self.config = config
+        self.voice = config.voice
+        self.rate = config.rate
+        self.volume = config.volume
+        self.output_format = config.output_format
+        self.sample_rate = config.sample_rate
+
+    def _encoder(self) -> AudioEncoder:
+        return AudioEncoder(
+            output_format=self.output_format, sample_rate=self.sample_rate
         )
 
+    async def stream(
+        self,
+        text: str,
+        voice: Optional[str] = None,
+        rate: Optional[str] = None,
+        volume: Optional[str] = None,
+    ) -> AsyncIterator[bytes]:
+        """
+        Synthesize text and yield audio encoded in the configured output format.
+
+        mp3 output is yielded chunk by chunk as it arrives; other formats are
+        transcoded once when the utterance is complete.
+
+        :param text: Text to be synthesized.
+        :param voice: Voice for this utterance, defaults to the configured voice.
+        :param rate: Speech rate for this utterance.
+        :param volume: Volume for this utterance.
+        :return: Async iterator of encoded audio bytes.
+        """
         # Create an Edge TTS client
         client = self.edge_tts.Communicate(
             text=text,
-            voice=self.voice,
-            rate=self.rate,
-            volume=self.volume,
+            voice=voice or self.voice,
+            rate=rate or self.rate,
+            volume=volume or self.volume,
+        )
+        encoder = self._encoder()
+
+        async for chunk in client.stream():
+            if chunk["type"] != "audio":
+                continue
+            with profiler.stage("tts.encode"):
+                data = encoder.feed(chunk["data"])
+            if data:
+                yield data
+
+        with profiler.stage("tts.encode"):
+            tail = encoder.finish()
+        if tail:
+            yield tail
+
+    async def synthesize(self, text: str, **kwargs: str) -> Any:
+        """
+        Synthesize text to audio using Edge TTS.
+
+        :param text: Text to be synthesized.
+        :param kwargs: Per-utterance `voice`, `rate` and `volume` overrides.
+        :return: Path of the synthesized audio file.
+        """
+        voice = kwargs.get("voice") or self.voice
+        rate = kwargs.get("rate") or self.rate
+        volume = kwargs.get("volume") or self.volume
+
+        logger.info(
+            f"合成音频: {text} voice: {voice}, rate: {rate}, "
+            f"volume: {volume}, format: {self.output_format}"
         )
 
         timestamp = time.strftime("%Y%m%d_%H%M%S")
         unique_id = uuid.uuid4().hex[:8]
-        audio_output = f"{self.output_path}output_edgetts_{timestamp}_{unique_id}.wav"
+        extension = self._encoder().extension
+        filename = f"output_edgetts_{timestamp}_{unique_id}{extension}"
 
         try:
-            await client.save(audio_output)
+            chunks = [
+                data
+                async for data in self.stream(
+                    text, voice=voice, rate=rate, volume=volume
+                )
+            ]
+            with profiler.stage("tts.write"):
+                audio_output = self.store.put(filename, b"".join(chunks))
             logger.info(f"音频合成成功，保存到: {audio_output}")
         except Exception as e:
             logger.error(f"合成音频失败: {e}")
@@ -73,11 +147,14 @@ class EdgeTTSHandler(TTSHandler):
     """
     Edge TTS 事件处理器
 
-    初始化需要 EdgeTTS 实例
+    初始化需要 EdgeTTS 实例；传入 ConfigService 时按 TTSEvent.session_id 应用会话级别的配置覆盖
     """
 
-    def __init__(self, tts: EdgeTTS) -> None:
+    def __init__(
+        self, tts: EdgeTTS, config_service: Optional[ConfigService] = None
+    ) -> None:
         self.tts = tts
+        self.config_service = config_service
 
     async def handle_event(self, event: BaseEvent) -> None:
         # 类型检查和转换
@@ -86,7 +163,18 @@ class EdgeTTSHandler(TTSHandler):
             return
         try:
             event.status = "processing"
-            audio_path = await self.tts.synthesize(event.text)
+            if self.config_service is not None and event.session_id:
+                edge_config = self.config_service.session_config(
+                    event.session_id
+                ).edge_tts
+                audio_path = await self.tts.synthesize(
+                    event.text,
+                    voice=edge_config.voice,
+                    rate=edge_config.rate,
+                    volume=edge_config.volume,
+                )
+            else:
+                audio_path = await self.tts.synthesize(event.text)
             if audio_path:
                 event.audio_path = audio_path
                 event.status = "completed"
@@ -97,8 +185,10 @@ class EdgeTTSHandler(TTSHandler):
             event.status = "failed"
 
 
-def register_edge_tts_handler(edge_tts: EdgeTTS) -> TTSHandler:
-    handler = EdgeTTSHandler(edge_tts)
+def register_edge_tts_handler(
+    edge_tts: EdgeTTS, config_service: Optional[ConfigService] = None
+) -> TTSHandler:
+    handler = EdgeTTSHandler(edge_tts, config_service)
     event_bus.subscribe(TTSEvent, handler.handle_event)
     logger.info("Edge TTS 事件处理器已注册")
     return handler
@@ -0,0 +1,118 @@
+import io
+from typing import Dict, List, get_args
+
+import numpy as np
+import numpy.typing as npt
+import soundfile as sf  # type: ignore
+
+from ..audio.resample import Resampler
+from ..types import audio_format_type
+
+FORMAT_EXTENSIONS: Dict[str, str] = {
+    "mp3": ".mp3",
+    "pcm16": ".pcm",
+    "wav": ".wav",
+    "opus": ".ogg",
+}
+
+# Opus 只支持这些采样率
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+
+class AudioEncoder:
+    """
+    单句（utterance）音频输出编码器。
+
+    TTS 后端以流的形式输出 MP3 数据块，编码器按目标格式处理:
+
+    - `mp3`: 直接透传，`feed` 原样返回每个数据块，不做任何解码。
+    - `pcm16` / `wav` / `opus`: `feed` 只缓存数据块，`finish` 时对整句解码一次、
+      重采样到 `sample_rate` 并编码为目标格式，全程在内存中完成。
+
+    每个实例只处理一句，`finish` 之后不能再调用 `feed`。
+    """
+
+    def __init__(
+        self,
+        output_format: audio_format_type = "mp3",
+        sample_rate: int = 24000,
+    ) -> None:
+        """
+        Args:
+            output_format (audio_format_type): 目标输出格式
+            sample_rate (int): 目标采样率，`mp3` 透传时忽略
+        """
+        if output_format not in get_args(audio_format_type):
+            raise ValueError(f"Unsupported audio output format: {output_format}")
+        if output_format == "opus" and sample_rate not in OPUS_SAMPLE_RATES:
+            raise ValueError(
+                f"Opus does not support sample rate {sample_rate}, "
+                f"expected one of {OPUS_SAMPLE_RATES}"
+            )
+        self.output_format = output_format
+        self.sample_rate = sample_rate
+        self._chunks: List[bytes] = []
+        self._finished = False
+
+    @property
+    def passthrough(self) -> bool:
+        """输出是否为透传（可以边收边发）"""
+        return self.output_format == "mp3"
+
+    @property
+    def extension(self) -> str:
+        """目标格式的文件扩展名"""
+        return FORMAT_EXTENSIONS[self.output_format]
+
+    def feed(self, chunk: bytes) -> bytes:
+        """
+        输入一个 MP3 数据块
+
+        Args:
+            chunk (bytes): TTS 后端输出的数据块
+
+        Returns:
+            bytes: 可以立即发送的编码数据，需要整句转码时返回空字节串
+        """
+        if self._finished:
+            raise RuntimeError("AudioEncoder.feed called after finish")
+        if self.passthrough:
+            return chunk
+        if chunk:
+            self._chunks.append(chunk)
+        return b""
+
+    def finish(self) -> bytes:
+        """
+        结束当前句子，返回剩余的编码数据
+
+        Returns:
+            bytes: 整句转码后的数据，透传模式下返回空字节串
+        """
+        self._finished = True
+        if self.passthrough or not self._chunks:
+            return b""
+
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        pcm = self._decode(data)
+        return self._encode(pcm)
+
+    def _decode(self, data: bytes) -> npt.NDArray[np.int16]:
+        """将整句 MP3 解码为目标采样率的单声道 int16 PCM"""
+        pcm: npt.NDArray[np.int16]
+        source_rate: int
+        pcm, source_rate = sf.read(io.BytesIO(data), dtype="int16")  # type: ignore
+        resampler = Resampler(source_rate, self.sample_rate, output_dtype=np.int16)
+        return np.concatenate([resampler.process(pcm), resampler.flush()])
+
+    def _encode(self, pcm: npt.NDArray[np.int16]) -> bytes:
+        if self.output_format == "pcm16":
+            return pcm.astype("<i2").tobytes()
+
+        buffer = io.BytesIO()
+        if self.output_format == "wav":
+            sf.write(buffer, pcm, self.sample_rate, format="WAV", subtype="PCM_16")  # type: ignore
+        else:
+            sf.write(buffer, pcm, self.sample_rate, format="OGG", subtype="OPUS")  # type: ignore
+        return buffer.getvalue()
@@ -0,0 +1,185 @@
+from ..event import BaseEvent, event_bus, TTSEvent, TTSHandler
+from ..configs import AppConfig
+from .abc import TTS
+from .output_store import OutputStore
+
+import asyncio
+import io
+import logging
+import os
+import re
+import time
+import uuid
+from typing import Any, AsyncIterator, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import soundfile as sf  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# 按句切分，保证每句合成完成后即可输出
+SENTENCE_PATTERN = re.compile(r"[^。！？；!?;\n]+[。！？；!?;\n]*")
+
+
+def split_sentences(text: str) -> List[str]:
+    """将文本切分为句子，去掉空白句"""
+    return [s.strip() for s in SENTENCE_PATTERN.findall(text) if s.strip()]
+
+
+class IndexTTS(TTS):
+    """
+    本地 IndexTTS 实现，需要安装 `index-tts` 可选依赖。
+
+    模型在构造时加载一次并常驻内存，所有请求共享同一个模型实例；推理在线程池中串行执行，
+    不阻塞事件循环。长文本按句合成，`stream` 每合成完一句就输出一块 PCM 数据。
+
+    配置示例 (configs/config.yaml):
+    ==============
+    TTS:
+      index_tts:
+        config: checkpoints/config.yaml
+        model_dir: checkpoints
+        voice: checkpoints/voice.wav
+        device: cpu
+    """
+
+    def __init__(
+        self,
+        app_config: AppConfig,
+        store: Optional[OutputStore] = None,
+        model: Any = None,
+    ) -> None:
+        """
+        Initialize the local IndexTTS model.
+
+        :param store: Output store for synthesized audio, defaults to the
+            store shared by all backends writing to `app_config.TTS.out_path`.
+        :param model: Preloaded model instance, loaded from the config when not given.
+        """
+        config = app_config.TTS.index_tts
+        try:
+            self.voice = config["voice"]
+        except KeyError as e:
+            raise ValueError(f"Configuration missing for IndexTTS: {e}") from e
+        self.device = config.get("device", "cpu")
+        self.store = store or OutputStore.shared(app_config.TTS)
+        self.model = model if model is not None else self._load_model(config)
+        self._lock = asyncio.Lock()
+
+        warmup = config.get("warmup", "")
+        if warmup:
+            self._infer(warmup)
+            logger.info("IndexTTS 预热完成")
+
+    def _load_model(self, config: dict[str, str]) -> Any:
+        try:
+            from indextts.infer import IndexTTS as IndexTTSModel  # type: ignore
+        except ImportError as e:
+            raise ImportError(
+                "IndexTTS requires the optional dependency: pip install .[index-tts]"
+            ) from e
+
+        cfg_path = config["config"]
+        model_dir = config.get("model_dir", os.path.dirname(cfg_path))
+        logger.info(f"加载 IndexTTS 模型: {model_dir}, device: {self.device}")
+        return IndexTTSModel(
+            cfg_path=cfg_path, model_dir=model_dir, is_fp16=False, device=self.device
+        )
+
+    def _infer(self, sentence: str) -> tuple[int, npt.NDArray[np.int16]]:
+        """同步合成一句，返回 (采样率, 单声道 int16 PCM)"""
+        sample_rate, wav = self.model.infer(self.voice, sentence, output_path=None)
+        return int(sample_rate), np.asarray(wav, dtype=np.int16).reshape(-1)
+
+    async def _infer_async(self, sentence: str) -> tuple[int, npt.NDArray[np.int16]]:
+        # 模型实例不是线程安全的，同一时间只允许一个推理
+        async with self._lock:
+            return await asyncio.to_thread(self._infer, sentence)
+
+    async def stream(self, text: str) -> AsyncIterator[tuple[int, bytes]]:
+        """
+        Synthesize text sentence by sentence.
+
+        :param text: Text to be synthesized.
+        :return: Async iterator of (sample_rate, PCM16 little-endian bytes) per sentence.
+        """
+        for sentence in split_sentences(text):
+            sample_rate, pcm = await self._infer_async(sentence)
+            yield sample_rate, pcm.astype("<i2").tobytes()
+
+    async def synthesize(self, text: str, **kwargs: str) -> Any:
+        """
+        Synthesize text to a WAV file using the local model.
+
+        :param text: Text to be synthesized.
+        :param kwargs: Additional parameters for synthesis.
+        :return: Path of the synthesized audio file.
+        """
+        logger.info(f"合成音频: {text} voice: {self.voice}")
+
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
+        unique_id = uuid.uuid4().hex[:8]
+        filename = f"output_indextts_{timestamp}_{unique_id}.wav"
+
+        try:
+            sample_rate = 0
+            chunks: List[bytes] = []
+            async for sample_rate, data in self.stream(text):
+                chunks.append(data)
+            if not chunks:
+                logger.error("合成音频失败: 文本为空")
+                return None
+
+            pcm = np.frombuffer(b"".join(chunks), dtype="<i2")
+            buffer = io.BytesIO()
+            sf.write(buffer, pcm, sample_rate, format="WAV", subtype="PCM_16")  # type: ignore
+            audio_output = self.store.put(filename, buffer.getvalue())
+            logger.info(f"音频合成成功，保存到: {audio_output}")
+        except Exception as e:
+            logger.error(f"合成音频失败: {e}")
+            return None
+
+        return audio_output
+
+
+class IndexTTSHandler(TTSHandler):
+    """
+    IndexTTS 事件处理器
+
+    初始化需要 IndexTTS 实例
+    """
+
+    def __init__(self, tts: IndexTTS) -> None:
+        self.tts = tts
+
+    async def handle_event(self, event: BaseEvent) -> None:
+        if not isinstance(event, TTSEvent):
+            logger.error("事件类型错误，必须是 TTSEvent")
+            return
+        try:
+            event.status = "processing"
+            audio_path = await self.tts.synthesize(event.text)
+            if audio_path:
+                event.audio_path = audio_path
+                event.status = "completed"
+            else:
+                event.status = "failed"
+        except Exception as e:
+            logger.error(f"处理 TTS 事件失败: {e}")
+            event.status = "failed"
+
+
+def register_index_tts_handler(index_tts: IndexTTS) -> TTSHandler:
+    handler = IndexTTSHandler(index_tts)
+    event_bus.subscribe(TTSEvent, handler.handle_event)
+    logger.info("IndexTTS 事件处理器已注册")
+    return handler
+
+
+def unregister_index_tts_handler(handler: IndexTTSHandler) -> None:
+    """
+    Unregister the IndexTTS handler from the event bus.
+    """
+    event_bus.unsubscribe(TTSEvent, handler.handle_event)
+    logger.info("IndexTTS 事件处理器已取消注册")
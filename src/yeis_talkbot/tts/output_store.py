@@ -0,0 +1,306 @@
+import asyncio
+import contextlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Literal, Optional
+
+from pydantic import BaseModel
+
+from ..configs import TTSConfig
+
+logger = logging.getLogger(__name__)
+
+MEMORY_PREFIX = "memory://"
+
+# (backend, 输出目录) -> 进程内共享的存储
+_shared_stores: Dict[tuple[str, str], "OutputStore"] = {}
+
+
+@dataclass
+class _Entry:
+    size: int
+    created: float
+    refs: int = 0
+
+
+class OutputStoreStats(BaseModel):
+    """TTS 输出存储的使用情况"""
+
+    files: int
+    bytes: int
+    in_use: int
+    expired: int
+    evicted: int
+    max_bytes: int
+    max_files: int
+
+
+class OutputStore:
+    """
+    TTS 音频输出的托管存储。
+
+    - 配额: 文件总大小超过 `max_bytes` 或数量超过 `max_files` 时，从最旧的未使用文件开始淘汰。
+    - 过期: 超过 `ttl` 秒且未被使用的文件由后台任务异步删除。
+    - 引用计数: 播放期间通过 `acquire` / `release`（或 `use`）持有文件，持有中的文件不会被删除。
+    - 共享: 同一输出目录应只由一个存储管理，使用 `shared` 获取进程内共享的实例。
+    - 后端: `disk` 写入 `out_path` 目录（可以指向 tmpfs，例如 `/dev/shm/tts/`）；
+      `memory` 只保存在进程内存中，路径形如 `memory://<name>`，通过 `read` 读取。
+
+    example usage:
+    ==============
+    store = OutputStore.shared(app_config.TTS)
+    path = store.put("hello.mp3", data)
+    with store.use(path):
+        play(store.read(path))
+    await store.stop()
+    """
+
+    def __init__(
+        self,
+        out_path: str = "tmp/tts/",
+        backend: Literal["disk", "memory"] = "disk",
+        max_bytes: int = 512 * 1024 * 1024,
+        max_files: int = 10000,
+        ttl: float = 600.0,
+        gc_interval: float = 60.0,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.out_path = out_path or "tmp/tts/"
+        self.backend = backend
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self.ttl = ttl
+        self.gc_interval = gc_interval
+        self.clock = clock
+
+        # path -> entry，按写入时间从旧到新排列
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._blobs: Dict[str, bytes] = {}
+        self._bytes = 0
+        self._expired = 0
+        self._evicted = 0
+        self._gc_task: Optional[asyncio.Task[None]] = None
+
+        if self.backend == "disk":
+            os.makedirs(self.out_path, exist_ok=True)
+            self._scan()
+
+    @classmethod
+    def from_config(cls, tts_config: TTSConfig) -> "OutputStore":
+        return cls(
+            out_path=tts_config.out_path,
+            backend=tts_config.output_backend,
+            max_bytes=tts_config.max_output_bytes,
+            max_files=tts_config.max_output_files,
+            ttl=tts_config.output_ttl,
+            gc_interval=tts_config.gc_interval,
+        )
+
+    @classmethod
+    def shared(cls, tts_config: TTSConfig) -> "OutputStore":
+        """
+        按 (backend, 输出目录) 返回进程内共享的存储
+
+        同一目录只能由一个存储管理，否则各自的配额和引用计数会互相冲突，
+        各个 TTS 后端默认都通过这里获取存储。
+        """
+        out_path = os.path.abspath(tts_config.out_path or "tmp/tts/")
+        key = (tts_config.output_backend, out_path)
+        store = _shared_stores.get(key)
+        if store is None:
+            store = _shared_stores[key] = cls.from_config(tts_config)
+        return store
+
+    def _scan(self) -> None:
+        """将目录中已有的文件（例如上次运行遗留的文件）纳入管理"""
+        found: List[tuple[float, str, int]] = []
+        with os.scandir(self.out_path) as it:
+            for entry in it:
+                if entry.is_file():
+                    stat = entry.stat()
+                    found.append((stat.st_mtime, entry.path, stat.st_size))
+        for mtime, path, size in sorted(found):
+            self._entries[path] = _Entry(size=size, created=mtime)
+            self._bytes += size
+        if found:
+            logger.info(f"TTS 输出目录已有 {len(found)} 个文件，共 {self._bytes} 字节")
+
+    def put(self, name: str, data: bytes) -> str:
+        """
+        保存一个音频文件
+
+        Args:
+            name (str): 文件名
+            data (bytes): 音频数据
+
+        Returns:
+            str: 文件路径，内存后端返回 `memory://<name>`
+        """
+        if self.backend == "memory":
+            path = f"{MEMORY_PREFIX}{name}"
+            self._blobs[path] = data
+        else:
+            path = os.path.join(self.out_path, name)
+            with open(path, "wb") as f:
+                f.write(data)
+
+        old = self._entries.pop(path, None)
+        if old is not None:
+            self._bytes -= old.size
+        self._entries[path] = _Entry(size=len(data), created=self.clock())
+        self._bytes += len(data)
+        self._enforce_quota(keep=path)
+        self._ensure_gc()
+        return path
+
+    def _ensure_gc(self) -> None:
+        """在事件循环中首次写入时启动后台清理任务"""
+        if self._gc_task is not None and not self._gc_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._gc_task = loop.create_task(self._gc_loop())
+
+    def read(self, path: str) -> bytes:
+        """读取一个音频文件"""
+        if path.startswith(MEMORY_PREFIX):
+            return self._blobs[path]
+        with open(path, "rb") as f:
+            return f.read()
+
+    def acquire(self, path: str) -> None:
+        """增加文件引用计数，持有期间文件不会被删除"""
+        entry = self._entries.get(path)
+        if entry is None:
+            raise KeyError(f"TTS output not found: {path}")
+        entry.refs += 1
+
+    def release(self, path: str) -> None:
+        """减少文件引用计数"""
+        entry = self._entries.get(path)
+        if entry is not None and entry.refs > 0:
+            entry.refs -= 1
+
+    @contextlib.contextmanager
+    def use(self, path: str) -> Iterator[str]:
+        """在 with 语句中持有文件"""
+        self.acquire(path)
+        try:
+            yield path
+        finally:
+            self.release(path)
+
+    def remove(self, path: str) -> None:
+        """立即删除文件，不检查引用计数"""
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= entry.size
+        self._delete([path])
+
+    def _delete(self, paths: List[str]) -> None:
+        for path in paths:
+            if path.startswith(MEMORY_PREFIX):
+                self._blobs.pop(path, None)
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"删除 TTS 输出文件失败: {path}, 错误: {e}")
+
+    def _take(self, path: str) -> None:
+        entry = self._entries.pop(path)
+        self._bytes -= entry.size
+
+    def _enforce_quota(self, keep: Optional[str] = None) -> None:
+        """
+        从最旧的未使用文件开始淘汰，直到满足配额
+
+        Args:
+            keep (str): 刚写入的文件，不参与淘汰；其他文件都被持有时暂时超出配额
+        """
+        victims: List[str] = []
+        for path, entry in list(self._entries.items()):
+            if self._bytes <= self.max_bytes and len(self._entries) <= self.max_files:
+                break
+            if entry.refs == 0 and path != keep:
+                self._take(path)
+                victims.append(path)
+        if self._bytes > self.max_bytes or len(self._entries) > self.max_files:
+            logger.warning("TTS 输出文件均被持有，暂时超出配额")
+        if victims:
+            self._evicted += len(victims)
+            logger.info(f"TTS 输出超出配额，淘汰 {len(victims)} 个文件")
+            self._delete(victims)
+
+    def _select_expired(self, now: float) -> List[str]:
+        deadline = now - self.ttl
+        victims: List[str] = []
+        for path, entry in list(self._entries.items()):
+            if entry.created > deadline:
+                break
+            if entry.refs == 0:
+                self._take(path)
+                victims.append(path)
+        self._expired += len(victims)
+        return victims
+
+    def gc(self, now: Optional[float] = None) -> int:
+        """
+        同步删除过期且未使用的文件
+
+        Returns:
+            int: 删除的文件数量
+        """
+        victims = self._select_expired(self.clock() if now is None else now)
+        self._delete(victims)
+        return len(victims)
+
+    async def collect(self) -> int:
+        """异步删除过期且未使用的文件，磁盘 IO 在线程池中执行"""
+        victims = self._select_expired(self.clock())
+        if victims:
+            await asyncio.to_thread(self._delete, victims)
+            logger.info(f"TTS 输出过期清理 {len(victims)} 个文件")
+        return len(victims)
+
+    async def _gc_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.gc_interval)
+            try:
+                await self.collect()
+            except Exception as e:
+                logger.error(f"TTS 输出清理失败: {e}")
+
+    async def start(self) -> None:
+        """启动后台清理任务，在事件循环中调用 `put` 时也会自动启动"""
+        self._ensure_gc()
+
+    async def stop(self) -> None:
+        """停止后台清理任务"""
+        if self._gc_task is not None:
+            self._gc_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._gc_task
+            self._gc_task = None
+
+    def stats(self) -> OutputStoreStats:
+        """当前磁盘（或内存）使用情况"""
+        return OutputStoreStats(
+            files=len(self._entries),
+            bytes=self._bytes,
+            in_use=sum(1 for entry in self._entries.values() if entry.refs > 0),
+            expired=self._expired,
+            evicted=self._evicted,
+            max_bytes=self.max_bytes,
+            max_files=self.max_files,
+        )
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._entries
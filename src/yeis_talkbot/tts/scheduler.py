@@ -0,0 +1,247 @@
+import asyncio
+import itertools
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..configs import ConfigService
+from ..event import BaseEvent, event_bus, TTSEvent, TTSHandler
+from .abc import TTS
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(order=True)
+class _Job:
+    # 优先级取负数，保证 priority 越大越先执行；相同优先级按提交顺序执行
+    sort_key: tuple[int, int]
+    text: str = field(compare=False)
+    kwargs: Dict[str, str] = field(compare=False)
+    future: "asyncio.Future[Optional[str]]" = field(compare=False)
+
+
+class _Backend:
+    def __init__(self, name: str, tts: TTS, limit: int) -> None:
+        self.name = name
+        self.tts = tts
+        self.limit = limit
+        self.queue: asyncio.PriorityQueue[_Job] = asyncio.PriorityQueue()
+        self.workers: List[asyncio.Task[None]] = []
+        self.active = 0
+
+
+class TTSScheduler:
+    """
+    TTS 合成调度器。
+
+    每个后端拥有一个优先级队列和 `limit` 个工作协程，因此同一后端同时进行的合成数
+    不会超过 `limit`，多个后端之间互不阻塞。后端的 TTS 实例在所有请求之间复用。
+    合成失败（抛出异常或返回 None）时按指数退避重试。
+
+    注意: edge_tts 每次合成都会新建并关闭自己的 HTTP 会话，无法复用连接，
+    这里复用的是 TTS 实例本身。
+
+    example usage:
+    ==============
+    scheduler = TTSScheduler({"edge": EdgeTTS(app_config)}, limits={"edge": 4})
+    await scheduler.start()
+    audio_path = await scheduler.submit("你好", priority=1)
+    await scheduler.stop()
+    """
+
+    def __init__(
+        self,
+        backends: Dict[str, TTS],
+        limits: Optional[Dict[str, int]] = None,
+        default_limit: int = 4,
+        max_retries: int = 2,
+        backoff: float = 0.5,
+        max_backoff: float = 5.0,
+    ) -> None:
+        """
+        Args:
+            backends (Dict[str, TTS]): 后端名称到 TTS 实例的映射，第一个为默认后端
+            limits (Dict[str, int]): 每个后端的最大并发数
+            default_limit (int): 未在 limits 中指定的后端的最大并发数
+            max_retries (int): 失败后的最大重试次数
+            backoff (float): 第一次重试前的等待秒数，之后每次翻倍
+            max_backoff (float): 单次重试等待的上限
+        """
+        if not backends:
+            raise ValueError("TTSScheduler requires at least one backend")
+        limits = limits or {}
+        self._backends: Dict[str, _Backend] = {
+            name: _Backend(name, tts, max(1, limits.get(name, default_limit)))
+            for name, tts in backends.items()
+        }
+        self.default_backend = next(iter(backends))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._counter = itertools.count()
+
+    async def start(self) -> None:
+        """为每个后端启动工作协程"""
+        for backend in self._backends.values():
+            if backend.workers:
+                continue
+            backend.workers = [
+                asyncio.create_task(self._worker(backend)) for _ in range(backend.limit)
+            ]
+            logger.info(f"TTS 后端 {backend.name} 已启动，并发上限 {backend.limit}")
+
+    async def stop(self) -> None:
+        """停止所有工作协程，未完成的请求会被取消"""
+        for backend in self._backends.values():
+            for worker in backend.workers:
+                worker.cancel()
+            await asyncio.gather(*backend.workers, return_exceptions=True)
+            backend.workers = []
+            while not backend.queue.empty():
+                job = backend.queue.get_nowait()
+                if not job.future.done():
+                    job.future.cancel()
+
+    def submit(
+        self,
+        text: str,
+        backend: Optional[str] = None,
+        priority: int = 0,
+        **kwargs: str,
+    ) -> "asyncio.Future[Optional[str]]":
+        """
+        提交一个合成请求
+
+        Args:
+            text (str): 要合成的文本
+            backend (str): 后端名称，默认为第一个后端
+            priority (int): 优先级，越大越先执行
+            kwargs: 传给 `TTS.synthesize` 的额外参数
+
+        Returns:
+            asyncio.Future[Optional[str]]: 合成结果，失败时为 None
+        """
+        name = backend or self.default_backend
+        if name not in self._backends:
+            raise KeyError(f"Unknown TTS backend: {name}")
+        future: asyncio.Future[Optional[str]] = (
+            asyncio.get_running_loop().create_future()
+        )
+        job = _Job((-priority, next(self._counter)), text, kwargs, future)
+        self._backends[name].queue.put_nowait(job)
+        return future
+
+    async def _worker(self, backend: _Backend) -> None:
+        while True:
+            job = await backend.queue.get()
+            try:
+                if job.future.cancelled():
+                    continue
+                backend.active += 1
+                try:
+                    result = await self._synthesize(backend, job)
+                finally:
+                    backend.active -= 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            except asyncio.CancelledError:
+                if not job.future.done():
+                    job.future.cancel()
+                raise
+            finally:
+                backend.queue.task_done()
+
+    async def _synthesize(self, backend: _Backend, job: _Job) -> Optional[str]:
+        for attempt in range(self.max_retries + 1):
+            try:
+                result: Any = await backend.tts.synthesize(job.text, **job.kwargs)
+                if result:
+                    return result
+                logger.warning(
+                    f"TTS 后端 {backend.name} 合成失败 (第 {attempt + 1} 次)"
+                )
+            except Exception as e:
+                logger.warning(
+                    f"TTS 后端 {backend.name} 合成异常 (第 {attempt + 1} 次): {e}"
+                )
+            if attempt < self.max_retries:
+                await asyncio.sleep(min(self.backoff * 2**attempt, self.max_backoff))
+        logger.error(f"TTS 合成失败，已重试 {self.max_retries} 次: {job.text}")
+        return None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """每个后端的队列长度和正在进行的合成数"""
+        return {
+            name: {
+                "queued": backend.queue.qsize(),
+                "active": backend.active,
+                "limit": backend.limit,
+            }
+            for name, backend in self._backends.items()
+        }
+
+
+class TTSSchedulerHandler(TTSHandler):
+    """
+    通过 TTSScheduler 处理 TTSEvent
+
+    使用 TTSEvent.priority 作为调度优先级；传入 ConfigService 时按 TTSEvent.session_id
+    应用会话级别的配置覆盖，与 EdgeTTSHandler 相同
+    """
+
+    def __init__(
+        self,
+        scheduler: TTSScheduler,
+        backend: Optional[str] = None,
+        config_service: Optional[ConfigService] = None,
+    ) -> None:
+        self.scheduler = scheduler
+        self.backend = backend
+        self.config_service = config_service
+
+    async def handle_event(self, event: BaseEvent) -> None:
+        if not isinstance(event, TTSEvent):
+            logger.error("事件类型错误，必须是 TTSEvent")
+            return
+        try:
+            event.status = "processing"
+            kwargs: Dict[str, str] = {}
+            if self.config_service is not None and event.session_id:
+                edge_config = self.config_service.session_config(
+                    event.session_id
+                ).edge_tts
+                kwargs = {
+                    "voice": edge_config.voice,
+                    "rate": edge_config.rate,
+                    "volume": edge_config.volume,
+                }
+            audio_path = await self.scheduler.submit(
+                event.text, backend=self.backend, priority=event.priority, **kwargs
+            )
+            if audio_path:
+                event.audio_path = audio_path
+                event.status = "completed"
+            else:
+                event.status = "failed"
+        except Exception as e:
+            logger.error(f"处理 TTS 事件失败: {e}")
+            event.status = "failed"
+
+
+def register_tts_scheduler_handler(
+    scheduler: TTSScheduler,
+    backend: Optional[str] = None,
+    config_service: Optional[ConfigService] = None,
+) -> TTSSchedulerHandler:
+    handler = TTSSchedulerHandler(scheduler, backend, config_service)
+    event_bus.subscribe(TTSEvent, handler.handle_event)
+    logger.info("TTS 调度事件处理器已注册")
+    return handler
+
+
+def unregister_tts_scheduler_handler(handler: TTSSchedulerHandler) -> None:
+    """
+    Unregister the TTS scheduler handler from the event bus.
+    """
+    event_bus.unsubscribe(TTSEvent, handler.handle_event)
+    logger.info("TTS 调度事件处理器已取消注册")
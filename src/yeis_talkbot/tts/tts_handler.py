@@ -1,3 +1,6 @@
+from typing import Optional
+
+from ..configs import ConfigService
 from ..event import TTSHandler
 from .edge_tts import (
     EdgeTTS,
@@ -5,15 +8,31 @@ from .edge_tts import (
     register_edge_tts_handler,
     unregister_edge_tts_handler,
 )
+from .index_tts import (
+    IndexTTS,
+    IndexTTSHandler,
+    register_index_tts_handler,
+    unregister_index_tts_handler,
+)
 from .abc import TTS
+from .scheduler import TTSSchedulerHandler, unregister_tts_scheduler_handler
 
 
-def register_tts_handler(TTS: TTS) -> TTSHandler | None:
+def register_tts_handler(
+    TTS: TTS, config_service: Optional[ConfigService] = None
+) -> TTSHandler | None:
     """
     注册所有 TTS 事件处理器
+
+    传入 config_service 时，支持会话级别配置覆盖的处理器会使用它
     """
     if isinstance(TTS, EdgeTTS):
-        handle: TTSHandler = register_edge_tts_handler(edge_tts=TTS)
+        handle: TTSHandler = register_edge_tts_handler(
+            edge_tts=TTS, config_service=config_service
+        )
+        return handle
+    if isinstance(TTS, IndexTTS):
+        handle = register_index_tts_handler(index_tts=TTS)
         return handle
     return None
 
@@ -21,3 +40,7 @@ def register_tts_handler(TTS: TTS) -> TTSHandler | None:
 def unregister_tts_handler(TTSHandler: TTSHandler):
     if isinstance(TTSHandler, EdgeTTSHandler):
         unregister_edge_tts_handler(handler=TTSHandler)
+    elif isinstance(TTSHandler, IndexTTSHandler):
+        unregister_index_tts_handler(handler=TTSHandler)
+    elif isinstance(TTSHandler, TTSSchedulerHandler):
+        unregister_tts_scheduler_handler(handler=TTSHandler)
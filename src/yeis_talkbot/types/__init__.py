@@ -1,3 +1,3 @@
-from .types import audio_type
+from .types import audio_format_type, audio_type
 
-__all__ = ["audio_type"]
+__all__ = ["audio_format_type", "audio_type"]
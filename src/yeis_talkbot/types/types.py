@@ -1,4 +1,4 @@
-from typing import Union
+from typing import Literal, Union
 import numpy as np
 import numpy.typing as npt
 
@@ -9,3 +9,13 @@ audio_type = Union[npt.NDArray[np.float32], npt.NDArray[np.int16]]
 | npt.NDArray[np.float32] | 已归一化的音频(-1~1范围) | 兼容大多数ML框架 | 需要转换原始数据      |
 | npt.NDArray[np.int16]   | 原始PCM/WAV数据     | 保持原始精度    | 需要手动归一化       |
 """
+
+audio_format_type = Literal["mp3", "pcm16", "wav", "opus"]
+"""
+| 格式    | 说明                               |
+|---------|------------------------------------|
+| mp3     | 直接透传 TTS 后端输出的 MP3 数据   |
+| pcm16   | 无文件头的 16-bit 小端单声道 PCM   |
+| wav     | 带 WAV 文件头的 16-bit 单声道 PCM  |
+| opus    | OGG 封装的 Opus                    |
+"""
@@ -0,0 +1,8 @@
+from .profiling import Profiler, SamplingProfiler, StageStats, profiler
+
+__all__ = [
+    "Profiler",
+    "SamplingProfiler",
+    "StageStats",
+    "profiler",
+]
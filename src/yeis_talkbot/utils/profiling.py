@@ -0,0 +1,330 @@
+import contextlib
+import cProfile
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterator, List, Optional, Set
+
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# 关闭时 `stage` 返回的共享空上下文
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class StageStats(BaseModel):
+    """一个阶段的累计开销"""
+
+    calls: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    alloc_bytes: int = 0
+
+
+class SamplingProfiler:
+    """
+    基于 `sys._current_frames` 的采样分析器。
+
+    后台线程每隔 `interval` 秒采集一次目标线程的调用栈，结果为折叠栈格式
+    （`a;b;c 计数`），可以直接交给 flamegraph.pl、speedscope 或 inferno 生成火焰图。
+    开销只取决于采样频率，与被分析代码的调用次数无关。
+    """
+
+    def __init__(
+        self, interval: float = 0.005, thread_ids: Optional[Set[int]] = None
+    ) -> None:
+        """
+        Args:
+            interval (float): 采样间隔（秒）
+            thread_ids (Set[int]): 要采样的线程，默认为除采样线程外的所有线程
+        """
+        self.interval = interval
+        self.thread_ids = thread_ids
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _collapse(frame: Optional[FrameType]) -> str:
+        names: List[str] = []
+        while frame is not None:
+            code = frame.f_code
+            names.append(
+                f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+            )
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def sample(self) -> None:
+        """采集一次调用栈"""
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            if self.thread_ids is not None and thread_id not in self.thread_ids:
+                continue
+            self.stacks[self._collapse(frame)] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.sample()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """折叠栈格式的采样结果"""
+        return "".join(
+            f"{stack} {count}\n" for stack, count in self.stacks.most_common()
+        )
+
+    def write_collapsed(self, path: str) -> None:
+        Path(path).write_text(self.collapsed(), encoding="utf-8")
+
+
+class Profiler:
+    """
+    可以在运行时开关的分阶段性能分析。
+
+    关闭时 `stage()` 只做一次布尔判断并返回共享的空上下文，热路径上几乎没有开销。
+    开启后每个阶段累计调用次数、墙钟时间、CPU 时间，可选地:
+
+    - `cprofile=True`: 每个阶段一个 cProfile，`dump` 时写出 `.prof` 文件，
+      同一时刻只有一个 cProfile 处于启用状态，嵌套或并发的阶段只记录时间
+    - `track_allocations=True`: 用 tracemalloc 记录阶段前后已分配内存的变化
+    - `sampling_interval`: 同时运行 `SamplingProfiler`，`dump` 时写出折叠栈
+
+    `sessions` / `stages` 限定只分析指定的会话或阶段，`by_session=True` 时按
+    (会话, 阶段) 分别统计。
+
+    cProfile 和 CPU 时间按线程统计，tracemalloc 则是进程级的；跨越 await 的阶段期间
+    同一线程上其他会话的协程也会运行，因此异步阶段需要以 `sync=False` 标记，只记录
+    调用次数和墙钟时间（包含等待时间）。指定 `alloc_filename` 时，异步阶段前后各取一次
+    tracemalloc 快照，只统计发生在该文件中的内存分配（例如事件处理器所在的模块）。
+    需要细分时在其中的同步代码上单独标记阶段。
+
+    example usage:
+    ==============
+    profiler.enable(cprofile=True, sampling_interval=0.005)
+    with profiler.stage("asr.generate", session_id):
+        ...
+    profiler.disable()
+    profiler.dump("tmp/profile")
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.cprofile = False
+        self.track_allocations = False
+        self.by_session = False
+        self.sessions: Optional[Set[str]] = None
+        self.stages: Optional[Set[str]] = None
+        self.stats: Dict[str, StageStats] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.sampler: Optional[SamplingProfiler] = None
+        # 同一时刻只能有一个 cProfile 启用，检查和占用需要加锁
+        self._active_profile: Optional[cProfile.Profile] = None
+        self._profile_lock = threading.Lock()
+        self._started_tracemalloc = False
+
+    def enable(
+        self,
+        cprofile: bool = False,
+        track_allocations: bool = False,
+        sampling_interval: Optional[float] = None,
+        sessions: Optional[Set[str]] = None,
+        stages: Optional[Set[str]] = None,
+        by_session: bool = False,
+    ) -> None:
+        """开启性能分析，已有的统计会被保留，需要时先调用 `reset`"""
+        self.cprofile = cprofile
+        self.track_allocations = track_allocations
+        self.sessions = sessions
+        self.stages = stages
+        self.by_session = by_session
+        if track_allocations and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if sampling_interval:
+            self.sampler = SamplingProfiler(sampling_interval)
+            self.sampler.start()
+        self.enabled = True
+        logger.info("性能分析已开启")
+
+    def disable(self) -> None:
+        """关闭性能分析，统计结果保留到 `reset`"""
+        self.enabled = False
+        if self.sampler is not None:
+            self.sampler.stop()
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        logger.info("性能分析已关闭")
+
+    def reset(self) -> None:
+        """清空统计结果"""
+        self.stats.clear()
+        self.profiles.clear()
+        self.sampler = None
+
+    def stage(
+        self,
+        name: str,
+        session_id: str = "",
+        sync: bool = True,
+        alloc_filename: Optional[str] = None,
+    ):
+        """
+        分析一个代码块
+
+        Args:
+            name (str): 阶段名称，例如 "asr.generate"
+            session_id (str): 会话 ID，用于按会话过滤或统计
+            sync (bool): 代码块中是否没有 await；异步阶段只记录调用次数和墙钟时间
+            alloc_filename (str): 异步阶段只统计发生在该源文件中的内存分配，
+                需要 `track_allocations=True`
+        """
+        if not self.enabled:
+            return _NULL_CONTEXT
+        if self.stages is not None and name not in self.stages:
+            return _NULL_CONTEXT
+        if self.sessions is not None and session_id not in self.sessions:
+            return _NULL_CONTEXT
+        key = f"{session_id}:{name}" if self.by_session and session_id else name
+        if not sync:
+            return self._measure_async(key, alloc_filename)
+        return self._measure(key)
+
+    def _stage_stats(self, key: str) -> StageStats:
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = StageStats()
+        return stats
+
+    def _acquire_profile(self, key: str) -> Optional[cProfile.Profile]:
+        if not self.cprofile:
+            return None
+        with self._profile_lock:
+            if self._active_profile is not None:
+                return None
+            profile = self.profiles.get(key)
+            if profile is None:
+                profile = self.profiles[key] = cProfile.Profile()
+            self._active_profile = profile
+        return profile
+
+    @contextlib.contextmanager
+    def _measure(self, key: str) -> Iterator[None]:
+        stats = self._stage_stats(key)
+        profile = self._acquire_profile(key)
+        if profile is not None:
+            profile.enable()
+
+        tracing = self.track_allocations and tracemalloc.is_tracing()
+        allocated = tracemalloc.get_traced_memory()[0] if tracing else 0
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            stats.cpu_time += time.thread_time() - cpu
+            stats.wall_time += time.perf_counter() - wall
+            if tracing and tracemalloc.is_tracing():
+                stats.alloc_bytes += tracemalloc.get_traced_memory()[0] - allocated
+            stats.calls += 1
+            if profile is not None:
+                profile.disable()
+                with self._profile_lock:
+                    self._active_profile = None
+
+    @contextlib.contextmanager
+    def _measure_async(
+        self, key: str, alloc_filename: Optional[str] = None
+    ) -> Iterator[None]:
+        stats = self._stage_stats(key)
+        before: Optional[tracemalloc.Snapshot] = None
+        filters = [tracemalloc.Filter(True, alloc_filename or "")]
+        if alloc_filename and self.track_allocations and tracemalloc.is_tracing():
+            before = tracemalloc.take_snapshot().filter_traces(filters)
+        wall = time.perf_counter()
+        try:
+            yield
+        finally:
+            stats.wall_time += time.perf_counter() - wall
+            if before is not None and tracemalloc.is_tracing():
+                after = tracemalloc.take_snapshot().filter_traces(filters)
+                stats.alloc_bytes += sum(
+                    diff.size_diff for diff in after.compare_to(before, "filename")
+                )
+            stats.calls += 1
+
+    def report(self) -> str:
+        """按墙钟时间排序的阶段统计"""
+        lines = [
+            f"{'stage':<40} {'calls':>8} {'wall(s)':>10} {'cpu(s)':>10} {'alloc':>12}"
+        ]
+        for key, stats in sorted(
+            self.stats.items(), key=lambda item: item[1].wall_time, reverse=True
+        ):
+            lines.append(
+                f"{key:<40} {stats.calls:>8} {stats.wall_time:>10.4f} "
+                f"{stats.cpu_time:>10.4f} {stats.alloc_bytes:>12}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, directory: str) -> List[str]:
+        """
+        写出分析结果
+
+        - `stages.txt`: 阶段统计
+        - `<阶段>.prof`: cProfile 结果，可以用 snakeviz / flameprof 查看
+        - `samples.folded`: 采样分析的折叠栈，可以用 flamegraph.pl / speedscope 生成火焰图
+
+        Returns:
+            List[str]: 写出的文件
+        """
+        out = Path(directory)
+        out.mkdir(parents=True, exist_ok=True)
+        written: List[str] = []
+
+        path = out / "stages.txt"
+        path.write_text(self.report() + "\n", encoding="utf-8")
+        written.append(str(path))
+
+        for key, profile in self.profiles.items():
+            safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+            path = out / f"{safe}.prof"
+            profile.dump_stats(str(path))
+            written.append(str(path))
+
+        if self.sampler is not None and self.sampler.samples:
+            path = out / "samples.folded"
+            self.sampler.write_collapsed(str(path))
+            written.append(str(path))
+
+        logger.info(f"性能分析结果已写入 {directory}")
+        return written
+
+
+profiler = Profiler()
@@ -0,0 +1,79 @@
+from typing import Any, List
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from src.yeis_talkbot.audio import (
+    AudioCapture,
+    FakeAudioSource,
+    RingBuffer,
+    frame_size_from_chunk_size,
+)
+
+
+def test_frame_size_from_chunk_size():
+    assert frame_size_from_chunk_size([0, 10, 5]) == 9600
+    assert frame_size_from_chunk_size([0, 8, 4], sample_rate=8000) == 3840
+
+
+def test_ring_buffer_wraps_without_copying_frames():
+    ring = RingBuffer(frame_size=4, capacity_frames=2)
+    ring.write(np.arange(6, dtype=np.int16))
+    ring.consume()
+    ring.write(np.arange(6, 12, dtype=np.int16))
+
+    frame = ring.peek()
+    assert frame is not None
+    assert frame.tolist() == [4, 5, 6, 7]
+    assert np.shares_memory(frame, ring._buffer)
+    ring.consume()
+
+    frame = ring.peek()
+    assert frame is not None
+    assert frame.tolist() == [8, 9, 10, 11]
+
+
+def test_ring_buffer_counts_overruns():
+    ring = RingBuffer(frame_size=4, capacity_frames=2)
+
+    assert ring.write(np.zeros(6, dtype=np.int16)) == 6
+    assert ring.write(np.zeros(5, dtype=np.int16)) == 2
+
+    assert ring.overruns == 1
+    assert ring.dropped == 3
+    assert ring.free() == 0
+
+
+@pytest.mark.asyncio
+async def test_capture_yields_frames_from_fake_source():
+    data = np.arange(10_000, dtype=np.int16)
+    source = FakeAudioSource(data, block_size=333)
+    capture = AudioCapture(source, frame_size=960, capacity_frames=16)
+
+    frames: List[npt.NDArray[Any]] = []
+    async with capture:
+        async for frame in capture.frames():
+            frames.append(frame.copy())
+
+    assert [len(f) for f in frames[:-1]] == [960] * 10
+    assert len(frames[-1]) == 400
+    assert np.array_equal(np.concatenate(frames), data)
+    assert capture.overruns == 0
+
+
+@pytest.mark.asyncio
+async def test_capture_overrun_when_reader_is_slow():
+    data = np.zeros(9600, dtype=np.int16)
+    source = FakeAudioSource(data, block_size=960)
+    capture = AudioCapture(source, frame_size=960, capacity_frames=2)
+
+    await capture.start()
+    assert source._thread is not None
+    source._thread.join()
+    received = [len(frame) async for frame in capture.frames()]
+    await capture.stop()
+
+    assert sum(received) == 1920
+    assert capture.overruns == 8
+    assert capture.dropped == 9600 - 1920
@@ -0,0 +1,82 @@
+from typing import Any, List
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+import soundfile as sf  # type: ignore
+
+from src.yeis_talkbot.audio import Resampler, polyphase_filter, to_mono_float
+
+
+def sine(rate: int, seconds: float = 1.0, freq: float = 440.0) -> npt.NDArray[Any]:
+    t = np.arange(int(rate * seconds)) / rate
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+@pytest.mark.parametrize("source_rate", [8000, 22050, 44100, 48000])
+def test_resample_to_16k_matches_reference(source_rate: int):
+    resampler = Resampler(source_rate, 16000)
+
+    out = np.concatenate([resampler.process(sine(source_rate)), resampler.flush()])
+
+    assert out.dtype == np.float32
+    assert len(out) == 16000
+    reference = sine(16000)
+    assert np.abs(out - reference)[100:-100].max() < 1e-3
+
+
+def test_chunked_output_equals_whole_output():
+    data = sine(44100, seconds=2.0)
+    resampler = Resampler(44100, 16000)
+    whole = np.concatenate([resampler.process(data), resampler.flush()])
+
+    rng = np.random.default_rng(0)
+    pieces: List[npt.NDArray[Any]] = []
+    i = 0
+    while i < len(data):
+        size = int(rng.integers(1, 2000))
+        pieces.append(resampler.process(data[i : i + size]))
+        i += size
+    pieces.append(resampler.flush())
+
+    assert np.array_equal(np.concatenate(pieces), whole)
+
+
+def test_filter_coefficients_are_cached():
+    assert polyphase_filter(48000, 16000) is polyphase_filter(48000, 16000)
+    assert polyphase_filter(48000, 16000).shape == (1, 32)
+    assert polyphase_filter(44100, 16000).shape == (160, 32)
+    assert not polyphase_filter(48000, 16000).flags.writeable
+
+
+def test_stereo_int16_downmix_and_int16_output():
+    left = np.full(4800, 2000, dtype=np.int16)
+    right = np.full(4800, 1000, dtype=np.int16)
+    resampler = Resampler(48000, 16000, output_dtype=np.int16)
+
+    out = resampler.process(np.stack([left, right], axis=1))
+
+    assert out.dtype == np.int16
+    assert np.all(np.abs(out[50:-50].astype(int) - 1500) <= 1)
+
+
+def test_same_rate_only_converts():
+    data = np.array([0, 16384, -32768], dtype=np.int16)
+
+    out = Resampler(16000, 16000).process(data)
+
+    assert out.tolist() == [0.0, 0.5, -1.0]
+    assert to_mono_float(np.ones((3, 2), dtype=np.float32)).shape == (3,)
+
+
+def test_resample_recorded_audio_for_asr():
+    data: npt.NDArray[np.int16]
+    data, rate = sf.read("tests/audio/test.wav", dtype="int16")  # type: ignore
+    resampler = Resampler(rate, 16000)
+
+    out = np.concatenate([resampler.process(data), resampler.flush()])
+
+    assert abs(len(out) - round(len(data) * 16000 / rate)) <= 1
+    assert out.ndim == 1
+    # 原始音频接近满幅，滤波后允许少量过冲
+    assert np.abs(out).max() < 1.1
@@ -0,0 +1,173 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pytest
+import soundfile as sf  # type: ignore
+
+from src.yeis_talkbot.bench import (
+    BenchmarkOptions,
+    FakeAutoModel,
+    FakeLLM,
+    TurnLatencyBenchmark,
+    fake_edge_tts_module,
+    format_report,
+    load_turn,
+    run_benchmark,
+    synthetic_turn,
+)
+from src.yeis_talkbot.configs import AppConfig, EdgeTTSConfig, MemoryConfig
+from src.yeis_talkbot.tts import AudioEncoder, EdgeTTS, OutputStore
+
+
+class StreamingASR:
+    """与 FunASR.transcribe 相同的调用方式，避免测试依赖 funasr"""
+
+    def __init__(self, model: FakeAutoModel) -> None:
+        self.model = model
+        self.cache: Dict[str, Any] = {}
+
+    def transcribe(
+        self,
+        chunk: Optional[Any],
+        is_final: bool = False,
+        chunk_size: Optional[List[int]] = None,
+    ) -> str:
+        if chunk is None:
+            chunk = np.zeros(0, dtype=np.float32)
+        res = self.model.generate(input=chunk, cache=self.cache, is_final=is_final)
+        return res[0]["text"]
+
+
+class StreamingTTS:
+    """EdgeTTS.stream 的最小实现，使用假 edge_tts 模块"""
+
+    def __init__(self, options: BenchmarkOptions) -> None:
+        self.edge_tts = fake_edge_tts_module(options)
+        self.config = EdgeTTSConfig()
+
+    async def stream(self, text: str):
+        encoder = AudioEncoder(self.config.output_format, self.config.sample_rate)
+        async for chunk in self.edge_tts.Communicate(text=text).stream():
+            yield encoder.feed(chunk["data"])
+
+
+OPTIONS = BenchmarkOptions(
+    asr_delay=0.005,
+    asr_rtf=0.0,
+    llm_first_token_delay=0.05,
+    llm_token_delay=0.0,
+    llm_reply="好的。",
+    tts_first_chunk_delay=0.03,
+    tts_chunk_delay=0.0,
+    tts_chunks=2,
+    vad_hangover=0.12,
+    playout_delay=0.01,
+    turns_per_session=2,
+    turn_gap=0.0,
+)
+
+
+def make_bench(tmp_path: Path) -> TurnLatencyBenchmark:
+    return TurnLatencyBenchmark(
+        StreamingASR(FakeAutoModel(OPTIONS.asr_delay, OPTIONS.asr_rtf)),
+        StreamingTTS(OPTIONS),
+        FakeLLM(OPTIONS.llm_reply, OPTIONS.llm_first_token_delay),
+        OPTIONS,
+        memory_config=MemoryConfig(spill_dir=str(tmp_path)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_turn_latency_reflects_backend_delays(tmp_path: Path):
+    turn = synthetic_turn(speech=0.3, silence=0.3)
+    report = await make_bench(tmp_path).run([turn], concurrency=2)
+
+    assert report.turns == 4 and report.failed == 0
+    ttfa = report.time_to_first_audio
+    # ASR 收尾 + LLM 首字 + TTS 首包
+    assert 0.085 <= ttfa.p50 < 0.5
+    # 额外包含 VAD 尾部静音和播放缓冲
+    m2e = report.mouth_to_ear
+    assert m2e.p50 >= ttfa.p50 + OPTIONS.vad_hangover
+    assert m2e.p50 <= m2e.p95 <= m2e.p99 <= m2e.max
+
+
+def make_edge_tts(
+    monkeypatch: pytest.MonkeyPatch, options: BenchmarkOptions
+) -> EdgeTTS:
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    tts = EdgeTTS(
+        AppConfig.from_yaml("configs/config.yaml"),
+        store=OutputStore(backend="memory"),
+        config=EdgeTTSConfig(),
+    )
+    tts.edge_tts = fake_edge_tts_module(options)
+    return tts
+
+
+@pytest.mark.asyncio
+async def test_real_edge_tts_with_fake_module(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    bench = TurnLatencyBenchmark(
+        StreamingASR(FakeAutoModel(OPTIONS.asr_delay, OPTIONS.asr_rtf)),
+        make_edge_tts(monkeypatch, OPTIONS),
+        FakeLLM(OPTIONS.llm_reply, OPTIONS.llm_first_token_delay),
+        OPTIONS,
+        memory_config=MemoryConfig(spill_dir=str(tmp_path)),
+    )
+    report = await bench.run([synthetic_turn(speech=0.3, silence=0.3)])
+
+    assert report.turns == 2 and report.failed == 0
+    assert report.time_to_first_audio.p50 >= OPTIONS.tts_first_chunk_delay
+
+
+@pytest.mark.asyncio
+async def test_real_funasr_with_fake_model(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    pytest.importorskip("funasr")
+    from src.yeis_talkbot.asr import FunASR
+
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    asr = FunASR(
+        AppConfig.from_yaml("configs/config.yaml"),
+        model=FakeAutoModel(OPTIONS.asr_delay, OPTIONS.asr_rtf),
+    )
+    bench = TurnLatencyBenchmark(
+        asr,
+        make_edge_tts(monkeypatch, OPTIONS),
+        FakeLLM(OPTIONS.llm_reply, OPTIONS.llm_first_token_delay),
+        OPTIONS,
+        memory_config=MemoryConfig(spill_dir=str(tmp_path)),
+    )
+    report = await bench.run([synthetic_turn(speech=0.3, silence=0.3)])
+
+    assert report.turns == 2 and report.failed == 0
+
+
+@pytest.mark.asyncio
+async def test_run_benchmark_levels_and_report():
+    turn = synthetic_turn(speech=0.2, silence=0.2)
+    options = OPTIONS.model_copy(update={"turns_per_session": 1})
+    reports = await run_benchmark(
+        StreamingASR(FakeAutoModel(0.0, 0.0)),
+        StreamingTTS(options),
+        FakeLLM("好。", 0.0, 0.0),
+        [turn],
+        concurrency_levels=(1, 3),
+        options=options,
+    )
+    assert [r.concurrency for r in reports] == [1, 3]
+    assert [r.turns for r in reports] == [1, 3]
+    table = format_report(reports).splitlines()
+    assert len(table) == 3
+
+
+def test_load_turn_resamples(tmp_path: Path):
+    path = tmp_path / "turn.wav"
+    sf.write(str(path), np.zeros((4800, 2), dtype=np.float32), 48000)
+    audio = load_turn(str(path))
+    assert audio.dtype == np.float32
+    assert len(audio) == 1600
@@ -0,0 +1,118 @@
+import os
+from pathlib import Path
+
+import pytest
+from pydantic import ValidationError
+
+from src.yeis_talkbot.configs import (
+    ConfigService,
+    ConfigSnapshot,
+    EdgeTTSConfig,
+    load_yaml,
+)
+
+APP_YAML = """
+TTS:
+  edge_tts:
+    config: {edge}
+ASR:
+  FunASR:
+    model: paraformer-zh-streaming
+VAD:
+  FunASR:
+    model: fsmn-vad
+LLM:
+  max_tokens: {max_tokens}
+"""
+
+
+def write(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+    # 保证修改时间变化，避免文件系统时间精度导致漏检
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def config_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    edge = tmp_path / "edge-tts.yaml"
+    app = tmp_path / "config.yaml"
+    write(edge, "voice: zh-CN-XiaoxiaoNeural\n")
+    write(app, APP_YAML.format(edge=edge, max_tokens=512))
+    return app, edge
+
+
+def test_load_yaml_is_cached_until_file_changes(tmp_path: Path):
+    path = tmp_path / "a.yaml"
+    write(path, "voice: a\n")
+
+    first = load_yaml(str(path))
+    first["voice"] = "mutated"
+    assert load_yaml(str(path)) == {"voice": "a"}
+
+    write(path, "voice: b\n")
+    assert load_yaml(str(path)) == {"voice": "b"}
+
+
+def test_reload_swaps_snapshot_and_notifies(config_files):
+    app, edge = config_files
+    service = ConfigService(str(app))
+    old = service.snapshot
+    received: list[ConfigSnapshot] = []
+    service.subscribe(received.append)
+
+    assert service.reload() is False
+
+    write(edge, "voice: zh-CN-YunxiNeural\n")
+    assert service.reload() is True
+
+    assert old.edge_tts.voice == "zh-CN-XiaoxiaoNeural"
+    assert service.snapshot.edge_tts.voice == "zh-CN-YunxiNeural"
+    assert service.snapshot.version == old.version + 1
+    assert received == [service.snapshot]
+    with pytest.raises(ValidationError):
+        service.snapshot.app.LLM.max_tokens = 1  # type: ignore[misc]
+
+
+def test_invalid_config_keeps_previous_snapshot(config_files):
+    app, _ = config_files
+    service = ConfigService(str(app))
+    snapshot = service.snapshot
+
+    write(app, "LLM: [not, a, mapping]\n")
+
+    assert service.reload() is False
+    assert service.snapshot is snapshot
+    # 在文件再次变化之前不会反复重试
+    assert service.reload() is False
+
+
+def test_session_overrides(config_files):
+    app, edge = config_files
+    service = ConfigService(str(app))
+
+    service.set_overrides("s1", voice="zh-CN-YunxiNeural")
+    service.set_overrides("s1", chunk_size=[0, 8, 4])
+
+    s1 = service.session_config("s1")
+    assert s1.edge_tts.voice == "zh-CN-YunxiNeural"
+    assert s1.edge_tts.rate == "+0%"
+    assert s1.chunk_size == [0, 8, 4]
+    assert service.session_config("s2").edge_tts.voice == "zh-CN-XiaoxiaoNeural"
+    assert service.session_config("s2").chunk_size == [0, 10, 5]
+
+    write(edge, "voice: zh-CN-XiaoyiNeural\nrate: '+10%'\n")
+    service.reload()
+    s1 = service.session_config("s1")
+    assert s1.edge_tts.voice == "zh-CN-YunxiNeural"
+    assert s1.edge_tts.rate == "+10%"
+
+    service.clear_overrides("s1")
+    assert service.session_config("s1").edge_tts.voice == "zh-CN-XiaoyiNeural"
+
+
+def test_edge_tts_config_is_immutable():
+    config = EdgeTTSConfig()
+    with pytest.raises(ValidationError):
+        config.voice = "other"  # type: ignore[misc]
@@ -0,0 +1,92 @@
+from typing import List, Optional
+
+import pytest
+
+from src.yeis_talkbot.event.bus import EventBus
+from src.yeis_talkbot.event.event import ASREvent, BaseEvent, TTSEvent
+
+
+class PriorityTTSEvent(TTSEvent):
+    pass
+
+
+class Recorder:
+    def __init__(self, name: str, log: List[str]) -> None:
+        self.name = name
+        self.log = log
+
+    async def handle_event(self, event: BaseEvent) -> None:
+        self.log.append(f"{self.name}:{event.event_name}")
+
+
+@pytest.mark.asyncio
+async def test_base_subscribers_receive_subclass_events():
+    bus = EventBus()
+    log: List[str] = []
+    tts, monitor = Recorder("tts", log), Recorder("monitor", log)
+    bus.subscribe(TTSEvent, tts.handle_event)
+    bus.subscribe_all(monitor.handle_event)
+
+    await bus.publish(PriorityTTSEvent(text="hi"))
+    await bus.publish(ASREvent())
+
+    assert log == [
+        "tts:PriorityTTSEvent",
+        "monitor:PriorityTTSEvent",
+        "monitor:ASREvent",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_cache_invalidated_on_subscription_change():
+    bus = EventBus()
+    log: List[str] = []
+    first, second = Recorder("first", log), Recorder("second", log)
+    bus.subscribe(TTSEvent, first.handle_event)
+
+    assert bus.handlers_for(TTSEvent) == (first.handle_event,)
+    assert bus.handlers_for(TTSEvent) is bus.handlers_for(TTSEvent)
+
+    bus.subscribe(BaseEvent, second.handle_event)
+    assert bus.handlers_for(TTSEvent) == (first.handle_event, second.handle_event)
+
+    bus.unsubscribe(TTSEvent, first.handle_event)
+    await bus.publish(TTSEvent())
+    assert log == ["second:TTSEvent"]
+
+
+def test_duplicate_subscription_and_missing_unsubscribe():
+    bus = EventBus()
+    recorder = Recorder("r", [])
+    bus.subscribe(TTSEvent, recorder.handle_event)
+    bus.subscribe(BaseEvent, recorder.handle_event)
+
+    assert bus.handlers_for(TTSEvent) == (recorder.handle_event,)
+
+    bus.unsubscribe(ASREvent, recorder.handle_event)
+    bus.unsubscribe(TTSEvent, recorder.handle_event)
+    bus.unsubscribe(TTSEvent, recorder.handle_event)
+    assert bus.handlers_for(ASREvent) == (recorder.handle_event,)
+
+
+@pytest.mark.asyncio
+async def test_done_tap_runs_after_handlers_and_on_error():
+    bus = EventBus()
+    log: List[str] = []
+
+    async def handler(event: BaseEvent) -> None:
+        log.append("handler")
+        if isinstance(event, ASREvent):
+            raise RuntimeError("boom")
+
+    def done(event: BaseEvent, error: Optional[BaseException]) -> None:
+        log.append(f"done:{type(error).__name__ if error else None}")
+
+    bus.subscribe_all(handler)
+    bus.add_done_tap(done)
+    await bus.publish(TTSEvent())
+    with pytest.raises(RuntimeError):
+        await bus.publish(ASREvent())
+    bus.remove_done_tap(done)
+
+    assert log == ["handler", "done:None", "handler", "done:RuntimeError"]
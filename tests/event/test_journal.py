@@ -0,0 +1,125 @@
+import os
+import struct
+from typing import List
+
+import pytest
+
+from src.yeis_talkbot.event.bus import EventBus
+from src.yeis_talkbot.event.event import ASREvent, BaseEvent, TTSEvent
+from src.yeis_talkbot.event.journal import (
+    EventJournal,
+    main,
+    read_journal,
+    replay_journal,
+)
+
+
+@pytest.mark.asyncio
+async def test_record_and_read_with_audio(tmp_path):
+    audio = tmp_path / "in.wav"
+    audio.write_bytes(b"RIFFdata")
+    bus = EventBus()
+
+    async def mutate(event: BaseEvent) -> None:
+        assert isinstance(event, TTSEvent)
+        event.status = "completed"
+
+    bus.subscribe(TTSEvent, mutate)
+    path = str(tmp_path / "events.ytj")
+    with EventJournal(path).attach(bus):
+        await bus.publish(ASREvent(audio_path=str(audio)))
+        await bus.publish(TTSEvent(text="你好"))
+    await bus.publish(TTSEvent(text="not recorded"))
+
+    records = list(read_journal(path))
+
+    assert [r.event_type for r in records] == ["ASREvent", "TTSEvent"]
+    assert records[0].audio == b"RIFFdata"
+    assert records[0].audio_ext == ".wav"
+    assert records[1].data["text"] == "你好"
+    # 记录的是发布时的状态，而不是处理器修改后的状态
+    assert records[1].data["status"] == "pending"
+    assert records[0].t <= records[1].t
+
+
+@pytest.mark.asyncio
+async def test_tts_output_recorded_after_handlers(tmp_path):
+    output = tmp_path / "out.mp3"
+    bus = EventBus()
+
+    async def synthesize(event: BaseEvent) -> None:
+        assert isinstance(event, TTSEvent)
+        output.write_bytes(b"ID3audio")
+        event.audio_path = str(output)
+        event.status = "completed"
+
+    bus.subscribe(TTSEvent, synthesize)
+    path = str(tmp_path / "events.ytj")
+    with EventJournal(path).attach(bus):
+        await bus.publish(TTSEvent(text="你好"))
+
+    records = list(read_journal(path))
+
+    assert [r.phase for r in records] == ["publish", "done"]
+    assert records[0].audio == b""
+    assert records[1].audio == b"ID3audio"
+    assert records[1].audio_ext == ".mp3"
+    assert records[1].data["status"] == "completed"
+
+    replayed = await replay_journal(
+        path, EventBus(), speed=0, audio_dir=str(tmp_path / "replay")
+    )
+    assert len(replayed) == 1
+
+
+def test_truncated_tail_is_ignored(tmp_path):
+    path = str(tmp_path / "events.ytj")
+    with EventJournal(path) as journal:
+        journal.record(TTSEvent(text="a"))
+    with open(path, "ab") as f:
+        f.write(struct.pack(">II", 100, 0) + b"{")
+
+    assert len(list(read_journal(path))) == 1
+
+
+@pytest.mark.asyncio
+async def test_replay_restores_events_and_audio(tmp_path):
+    audio = tmp_path / "in.wav"
+    audio.write_bytes(b"pcm")
+    ticks = iter([0.0, 0.0, 0.05])
+    path = str(tmp_path / "events.ytj")
+    with EventJournal(path, clock=lambda: next(ticks)) as journal:
+        original = ASREvent(audio_path=str(audio))
+        journal.record(original)
+        journal.record(TTSEvent(text="回复"))
+
+    bus = EventBus()
+    seen: List[BaseEvent] = []
+
+    async def collect(event: BaseEvent) -> None:
+        seen.append(event)
+
+    bus.subscribe_all(collect)
+    replayed = await replay_journal(
+        path, bus, speed=10.0, audio_dir=str(tmp_path / "replay")
+    )
+
+    assert [type(e) for e in replayed] == [ASREvent, TTSEvent]
+    assert seen == replayed
+    restored = replayed[0]
+    assert isinstance(restored, ASREvent)
+    assert restored.event_id == original.event_id
+    assert restored.audio_path != original.audio_path
+    with open(restored.audio_path, "rb") as f:
+        assert f.read() == b"pcm"
+
+
+def test_cli_summary(tmp_path, capsys):
+    path = str(tmp_path / "events.ytj")
+    with EventJournal(path) as journal:
+        journal.record(TTSEvent(text="a"))
+        journal.record(TTSEvent(text="b"))
+
+    assert main([path]) == 0
+    assert "TTSEvent: 2" in capsys.readouterr().out
+    assert os.path.getsize(path) > 4
@@ -0,0 +1,161 @@
+from typing import List
+
+import pytest
+
+from src.yeis_talkbot.configs import LLMConfig, MemoryConfig
+from src.yeis_talkbot.memory import (
+    ChatMessage,
+    ConversationHistory,
+    HistoryStore,
+    estimate_tokens,
+)
+
+
+def word_counter(text: str) -> int:
+    return len(text.split())
+
+
+def test_estimate_tokens():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("你好世界") == 4
+    assert estimate_tokens("abcdefgh") == 2
+
+
+def test_token_count_computed_once():
+    calls: List[str] = []
+
+    def counter(text: str) -> int:
+        calls.append(text)
+        return word_counter(text)
+
+    history = ConversationHistory("s1", token_counter=counter)
+    history.add("user", "a b c")
+    history.add("assistant", "d e")
+    for _ in range(3):
+        history.build_context(budget=100)
+
+    assert calls == ["a b c", "d e"]
+    assert history.total_tokens == 5
+
+
+def test_build_context_within_budget_drops_old_turns():
+    history = ConversationHistory(
+        "s1", token_counter=word_counter, system_prompt="be nice"
+    )
+    for i in range(10):
+        history.add("user", f"question {i}")
+        history.add("assistant", f"answer {i} ok")
+
+    context = history.build_context(budget=12)
+
+    assert context[0] == ("system", "be nice")
+    assert sum(word_counter(content) for _, content in context) <= 12
+    assert context[-1] == ("assistant", "answer 9 ok")
+    assert history.total_tokens == sum(m.tokens for m in history.messages)
+
+
+def test_build_context_does_not_destroy_history():
+    history = ConversationHistory("s1", token_counter=word_counter)
+    for i in range(5):
+        history.add("user", f"question {i}")
+
+    assert history.build_context(budget=4) == [
+        ("user", "question 3"),
+        ("user", "question 4"),
+    ]
+    assert len(history) == 5
+    assert len(history.build_context(budget=100)) == 5
+
+
+def test_oversized_newest_user_turn_is_truncated():
+    history = ConversationHistory(
+        "s1", token_counter=word_counter, system_prompt="be nice"
+    )
+    history.add("user", "short question")
+    history.add("assistant", "short answer")
+    history.add("user", " ".join(f"w{i}" for i in range(50)))
+
+    context = history.build_context(budget=6)
+
+    assert context[0] == ("system", "be nice")
+    assert context[-1][0] == "user"
+    assert context[-1][1].endswith("w49")
+    assert sum(word_counter(content) for _, content in context) <= 6
+    assert len(history) == 3
+    assert history.messages[-1].tokens == 50
+
+
+def test_system_prompt_over_budget_raises():
+    history = ConversationHistory(
+        "s1", token_counter=word_counter, system_prompt="a b c d"
+    )
+    history.add("user", "hello")
+    with pytest.raises(ValueError):
+        history.build_context(budget=4)
+
+
+def test_old_turns_folded_into_summary():
+    def summarizer(previous: str, removed: List[ChatMessage]) -> str:
+        return f"{previous} {len(removed)} earlier turns".strip()
+
+    history = ConversationHistory(
+        "s1", token_counter=word_counter, max_messages=4, summarizer=summarizer
+    )
+    for i in range(6):
+        history.add("user", f"turn {i}")
+
+    assert len(history) == 4
+    assert history.summary is not None
+    context = history.build_context(budget=100)
+    assert context[0][0] == "system"
+    assert context[-1] == ("user", "turn 5")
+
+
+def test_store_evicts_idle_and_lru_sessions():
+    now = [0.0]
+    store = HistoryStore(
+        LLMConfig(max_tokens=64),
+        MemoryConfig(max_sessions=2, session_ttl=10.0, max_messages=8),
+        token_counter=word_counter,
+        clock=lambda: now[0],
+    )
+    store.add("a", "user", "hello")
+    now[0] = 5.0
+    store.add("b", "user", "hello")
+    now[0] = 6.0
+    store.add("c", "user", "hello")
+
+    assert "a" not in store
+    assert len(store) == 2
+
+    now[0] = 15.5
+    assert store.evict_idle() == 1
+    assert "b" not in store
+    assert "c" in store
+
+
+def test_store_uses_llm_max_tokens_budget():
+    store = HistoryStore(LLMConfig(max_tokens=4), token_counter=word_counter)
+    store.add("a", "user", "one two")
+    store.add("a", "assistant", "three four")
+    store.add("a", "user", "five six")
+
+    assert store.build_context("a") == [
+        ("assistant", "three four"),
+        ("user", "five six"),
+    ]
+
+
+def test_summary_reserved_when_history_exceeds_budget():
+    def summarizer(previous: str, removed: List[ChatMessage]) -> str:
+        return "summary"
+
+    history = ConversationHistory(
+        "s1", token_counter=word_counter, max_messages=4, summarizer=summarizer
+    )
+    for i in range(6):
+        history.add("user", f"turn {i}")
+
+    # 4 条消息共 8 个 token，超出预算
+    context = history.build_context(budget=6)
+    assert context == [("system", "summary"), ("user", "turn 4"), ("user", "turn 5")]
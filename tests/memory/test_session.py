@@ -0,0 +1,160 @@
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.yeis_talkbot.configs import LLMConfig, MemoryConfig
+from src.yeis_talkbot.memory import HistoryStore, SessionMemoryManager, deep_sizeof
+
+
+class FakeASR:
+    """每次识别向缓存追加 1000 个 float32，返回固定文本"""
+
+    def __init__(self) -> None:
+        self.cache: Dict[str, Any] = {}
+        self.chunk_sizes: List[Optional[List[int]]] = []
+
+    def transcribe(
+        self,
+        chunk: Optional[Any],
+        is_final: bool = False,
+        chunk_size: Optional[List[int]] = None,
+    ) -> str:
+        self.chunk_sizes.append(chunk_size)
+        self.cache.setdefault("frames", []).append(np.zeros(1000, dtype=np.float32))
+        return "好" if not is_final else "。"
+
+    def reset(self) -> None:
+        self.cache = {}
+
+
+def make_manager(
+    tmp_path: Path, **kwargs: Any
+) -> tuple[SessionMemoryManager, List[float]]:
+    now = [0.0]
+    config = MemoryConfig(spill_dir=str(tmp_path), **kwargs)
+    return SessionMemoryManager(config, clock=lambda: now[0]), now
+
+
+def test_deep_sizeof_counts_arrays_once():
+    array = np.zeros(1000, dtype=np.float32)
+    assert deep_sizeof({"a": array, "b": [array]}) >= 4000
+    assert deep_sizeof({"a": array, "b": [array]}) < 8000
+
+
+def test_transcribe_keeps_per_session_cache_and_compacts(tmp_path: Path):
+    manager, _ = make_manager(tmp_path)
+    asr = FakeASR()
+
+    manager.transcribe("a", asr, None)
+    manager.transcribe("b", asr, None)
+    manager.transcribe("a", asr, None)
+
+    assert len(manager.get("a").asr_cache["frames"]) == 2
+    assert len(manager.get("b").asr_cache["frames"]) == 1
+    assert asr.cache == {}
+    before = manager.stats().hot_bytes
+
+    manager.transcribe("a", asr, None, is_final=True)
+    state = manager.get("a")
+    assert state.asr_cache == {}
+    assert list(state.transcript) == ["好好。"]
+    assert manager.stats().hot_bytes < before
+
+
+def test_transcribe_passes_session_chunk_size(tmp_path: Path):
+    manager, _ = make_manager(tmp_path)
+    asr = FakeASR()
+
+    manager.transcribe("a", asr, None, chunk_size=[0, 8, 4])
+    manager.transcribe("a", asr, None)
+
+    assert asr.chunk_sizes == [[0, 8, 4], None]
+
+
+def test_budget_spills_and_restores(tmp_path: Path):
+    manager, _ = make_manager(tmp_path, ram_budget=12000)
+    asr = FakeASR()
+
+    for session_id in ("a", "b", "c"):
+        manager.transcribe(session_id, asr, None)
+        manager.transcribe(session_id, asr, None)
+    manager.get("a").history.add("user", "你好")
+
+    stats = manager.stats()
+    assert stats.hot_bytes <= 12000
+    assert stats.spilled_sessions >= 1
+    assert len(manager) == 3
+    assert list(tmp_path.glob("*.pkl"))
+
+    manager.transcribe("a", asr, None)
+    restored = manager.get("a")
+    assert len(restored.asr_cache["frames"]) == 3
+    assert restored.partial == "好好好"
+    assert manager.stats().restores >= 1
+
+
+def test_spill_idle_and_expire(tmp_path: Path):
+    manager, now = make_manager(tmp_path, spill_after=10, session_ttl=100)
+    manager.get("a").history.add("user", "hello")
+    manager.touch("a")
+
+    now[0] = 20
+    manager.get("b")
+    assert manager.spill_idle() == 1
+    assert "a" in manager
+    assert manager.get("a").history.messages[0].content == "hello"
+
+    now[0] = 200
+    manager.spill("a")
+    manager.spill_idle()
+    assert "a" not in manager and "b" not in manager
+    assert not list(tmp_path.glob("*.pkl"))
+
+
+def test_history_growth_alone_triggers_spill(tmp_path: Path):
+    manager, _ = make_manager(tmp_path, ram_budget=20000, max_messages=1000)
+    history = manager.get("a").history
+    for i in range(10):
+        history.add("user", f"消息{i}" * 1000)
+    assert manager.touch("a") > 20000
+
+    manager.get("b")
+
+    assert manager.stats().spilled_sessions == 1
+    assert manager.stats().hot_bytes <= 20000
+    assert len(manager.get("a").history) == 10
+
+
+def test_history_store_shares_session_state(tmp_path: Path):
+    manager, now = make_manager(tmp_path, max_sessions=2, session_ttl=10)
+    store = HistoryStore(LLMConfig(max_tokens=64), sessions=manager)
+
+    store.add("a", "user", "你好")
+    assert manager.get("a").history is store.get("a")
+    assert manager.stats().hot_bytes > 0
+
+    manager.spill("a")
+    now[0] = 5
+    store.add("b", "user", "hello")
+    now[0] = 6
+    store.add("c", "user", "hello")
+    assert "a" not in manager
+    assert not list(tmp_path.glob("*.pkl"))
+
+    now[0] = 15.5
+    assert store.evict_idle() == 1
+    assert "b" not in store and "c" in store
+
+
+def test_get_refreshes_activity_for_expiry(tmp_path: Path):
+    manager, now = make_manager(tmp_path, session_ttl=10)
+    manager.get("a")
+    now[0] = 8
+    manager.get("b")
+    now[0] = 9
+    manager.get("a")
+
+    now[0] = 18.5
+    assert manager.expire() == 1
+    assert "a" in manager and "b" not in manager
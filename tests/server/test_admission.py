@@ -0,0 +1,136 @@
+import asyncio
+import json
+
+import pytest
+
+from src.yeis_talkbot.configs import AdmissionConfig
+from src.yeis_talkbot.event.bus import EventBus
+from src.yeis_talkbot.event.event import BaseEvent, TTSEvent
+from src.yeis_talkbot.server import AdmissionController, PromptCache, serve_health
+
+
+def make_controller(**kwargs: float) -> tuple[AdmissionController, list[float]]:
+    now = [0.0]
+    config = AdmissionConfig(
+        max_sessions=3, degrade_sessions=2, max_queue_depth=2, latency_slo=1.0
+    ).model_copy(update=kwargs)
+    prompts = PromptCache()
+    prompts.put("busy", "busy.mp3")
+    return AdmissionController(config, prompts=prompts, clock=lambda: now[0]), now
+
+
+def test_admit_degrade_and_reject_by_sessions():
+    controller, _ = make_controller()
+
+    assert controller.admit("a").decision == "accept"
+    assert controller.admit("b").decision == "accept"
+    assert controller.admit("c").decision == "degrade"
+    rejected = controller.admit("d")
+
+    assert rejected.decision == "reject"
+    assert rejected.fallback_audio == "busy.mp3"
+    assert not controller.ready()
+
+    controller.release("a")
+    assert controller.ready()
+    assert controller.health()["rejected"] == 1
+
+
+@pytest.mark.asyncio
+async def test_latency_and_queue_depth_from_bus():
+    controller, now = make_controller()
+    bus = EventBus()
+    release = asyncio.Event()
+
+    async def slow_tts(event: BaseEvent) -> None:
+        await release.wait()
+        now[0] += 1.5
+
+    bus.subscribe(TTSEvent, slow_tts)
+    controller.attach(bus)
+
+    tasks = [asyncio.create_task(bus.publish(TTSEvent())) for _ in range(2)]
+    await asyncio.sleep(0)
+    assert controller.queue_depth() == 2
+    assert controller.admit("a").decision == "reject"
+
+    release.set()
+    await asyncio.gather(*tasks)
+    controller.detach()
+
+    assert controller.queue_depth() == 0
+    assert controller.latency_p95()["TTSEvent"] == 3.0
+    admission = controller.admit("a")
+    assert admission.decision == "degrade"
+    assert "TTSEvent" in admission.reason
+
+
+@pytest.mark.asyncio
+async def test_health_endpoints():
+    controller, _ = make_controller(max_sessions=1)
+    server = await serve_health(controller, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+
+    async def get(path: str) -> tuple[int, dict[str, object]]:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\n\r\n".encode())
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, body = response.split(b"\r\n\r\n", 1)
+        return int(head.split()[1]), json.loads(body)
+
+    assert await get("/readyz") == (200, {"ready": True})
+    controller.admit("a")
+    assert await get("/readyz") == (503, {"ready": False})
+    status, health = await get("/healthz")
+    assert status == 200
+    assert health["sessions"] == 1
+    assert (await get("/unknown"))[0] == 404
+
+    server.close()
+    await server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_failed_handler_leaves_no_in_flight_entry():
+    controller, _ = make_controller()
+    bus = EventBus()
+
+    async def broken(event: BaseEvent) -> None:
+        raise RuntimeError("boom")
+
+    bus.subscribe(TTSEvent, broken)
+    controller.attach(bus)
+    with pytest.raises(RuntimeError):
+        await bus.publish(TTSEvent())
+    controller.detach()
+
+    assert controller.queue_depth() == 0
+    assert "TTSEvent" in controller.latency_p95()
+
+
+@pytest.mark.asyncio
+async def test_stalled_event_counts_toward_latency():
+    controller, now = make_controller()
+    bus = EventBus()
+    release = asyncio.Event()
+
+    async def stalled(event: BaseEvent) -> None:
+        await release.wait()
+
+    bus.subscribe(TTSEvent, stalled)
+    controller.attach(bus)
+    task = asyncio.create_task(bus.publish(TTSEvent()))
+    await asyncio.sleep(0)
+
+    now[0] = 70.0
+    admission = controller.evaluate()
+    assert admission.decision == "degrade"
+    assert controller.queue_depth() == 0
+    assert controller.latency_p95()["TTSEvent"] == 70.0
+
+    release.set()
+    await task
+    controller.detach()
+    assert list(controller._latency["TTSEvent"]) == [70.0]
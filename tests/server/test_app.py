@@ -0,0 +1,20 @@
+import importlib
+
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_config_reload_reaches_tts(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    app = importlib.import_module("src.yeis_talkbot.server.app")
+
+    await app.startup()
+    try:
+        assert app.config_service._watch_task is not None
+        app.tts.voice = "stale-voice"
+        assert app.config_service.reload(force=True)
+        assert app.tts.voice == app.config_service.snapshot.edge_tts.voice
+        assert app.tts.config == app.config_service.snapshot.edge_tts
+    finally:
+        await app.shutdown()
+    assert app.config_service._watch_task is None
@@ -1,6 +1,13 @@
 import pytest
 from src.yeis_talkbot.tts.edge_tts import EdgeTTS
-from src.yeis_talkbot.configs import AppConfig
+from src.yeis_talkbot.configs import AppConfig, ConfigService
+from src.yeis_talkbot.event.bus import event_bus
+from src.yeis_talkbot.event.event import TTSEvent
+from src.yeis_talkbot.tts import (
+    OutputStore,
+    register_tts_handler,
+    unregister_tts_handler,
+)
 import os
 
 
@@ -12,3 +19,38 @@ async def test_edge_tts_synthesize():
     audio_output = await tts.synthesize(text)
     assert audio_output is not None
     os.remove(audio_output)  # Clean up the generated audio file
+
+
+class FakeCommunicate:
+    """记录参数并返回空 MP3 流的 edge_tts.Communicate 替身"""
+
+    calls: list[dict[str, str]] = []
+
+    def __init__(self, text: str, voice: str, rate: str, volume: str) -> None:
+        FakeCommunicate.calls.append({"voice": voice, "rate": rate, "volume": volume})
+
+    async def stream(self):
+        yield {"type": "audio", "data": b"\xff\xfb"}
+
+
+@pytest.mark.asyncio
+async def test_edge_tts_session_overrides(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setattr(EdgeTTS.edge_tts, "Communicate", FakeCommunicate)
+    FakeCommunicate.calls = []
+    service = ConfigService("configs/config.yaml")
+    snapshot = service.snapshot
+    tts = EdgeTTS(
+        snapshot.app, store=OutputStore(backend="memory"), config=snapshot.edge_tts
+    )
+    handler = register_tts_handler(tts, config_service=service)
+    service.set_overrides("s1", voice="zh-CN-YunxiNeural", rate="+20%")
+
+    await event_bus.publish(TTSEvent(text="你好", session_id="s1"))
+    await event_bus.publish(TTSEvent(text="你好", session_id="s2"))
+    unregister_tts_handler(handler)
+
+    assert FakeCommunicate.calls == [
+        {"voice": "zh-CN-YunxiNeural", "rate": "+20%", "volume": "+0%"},
+        {"voice": "zh-CN-XiaoxiaoNeural", "rate": "+0%", "volume": "+0%"},
+    ]
@@ -0,0 +1,65 @@
+import io
+from typing import List
+
+import numpy as np
+import pytest
+import soundfile as sf  # type: ignore
+
+from src.yeis_talkbot.tts.encoding import AudioEncoder
+
+
+def make_mp3(seconds: float = 1.0, sample_rate: int = 24000) -> bytes:
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    wave = (0.3 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    buffer = io.BytesIO()
+    sf.write(buffer, wave, sample_rate, format="MP3")  # type: ignore
+    return buffer.getvalue()
+
+
+def split(data: bytes, size: int = 512) -> List[bytes]:
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_mp3_passthrough_streams_chunks():
+    mp3 = make_mp3()
+    encoder = AudioEncoder("mp3")
+
+    out = [encoder.feed(chunk) for chunk in split(mp3)]
+
+    assert encoder.passthrough
+    assert all(out)
+    assert b"".join(out) + encoder.finish() == mp3
+
+
+def test_pcm16_transcoded_once_at_target_rate():
+    encoder = AudioEncoder("pcm16", sample_rate=16000)
+
+    out = [encoder.feed(chunk) for chunk in split(make_mp3(seconds=1.0))]
+    pcm = encoder.finish()
+
+    assert not any(out)
+    samples = len(pcm) // 2
+    # MP3 编码会带来少量首尾填充
+    assert 16000 <= samples < 16000 * 1.1
+    with pytest.raises(RuntimeError):
+        encoder.feed(b"\x00")
+
+
+@pytest.mark.parametrize("output_format,sample_rate", [("wav", 16000), ("opus", 48000)])
+def test_container_formats_are_decodable(output_format: str, sample_rate: int):
+    encoder = AudioEncoder(output_format, sample_rate=sample_rate)  # type: ignore
+    for chunk in split(make_mp3()):
+        encoder.feed(chunk)
+
+    data, rate = sf.read(io.BytesIO(encoder.finish()), dtype="int16")  # type: ignore
+
+    assert rate == sample_rate
+    assert data.ndim == 1
+    assert len(data) > 0
+
+
+def test_invalid_formats_rejected():
+    with pytest.raises(ValueError):
+        AudioEncoder("flac")  # type: ignore
+    with pytest.raises(ValueError):
+        AudioEncoder("opus", sample_rate=44100)
@@ -0,0 +1,103 @@
+import io
+from typing import Any, List, Optional
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+import soundfile as sf  # type: ignore
+
+from src.yeis_talkbot.configs import (
+    AppConfig,
+    ASRConfig,
+    LLMConfig,
+    TTSConfig,
+    VADConfig,
+)
+from src.yeis_talkbot.event.bus import event_bus
+from src.yeis_talkbot.event.event import TTSEvent
+from src.yeis_talkbot.tts import (
+    IndexTTS,
+    IndexTTSHandler,
+    OutputStore,
+    register_tts_handler,
+    unregister_tts_handler,
+)
+from src.yeis_talkbot.tts.index_tts import split_sentences
+
+
+class FakeIndexTTSModel:
+    """模拟 indextts.infer.IndexTTS，每个字输出 100 个采样点"""
+
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def infer(
+        self, audio_prompt: str, text: str, output_path: Optional[str] = None
+    ) -> tuple[int, npt.NDArray[np.int16]]:
+        self.calls.append(text)
+        return 24000, np.ones((len(text) * 100, 1), dtype=np.int16)
+
+
+def make_app_config(**index_tts: str) -> AppConfig:
+    return AppConfig(
+        OPENAI_API_KEY="test",
+        TTS=TTSConfig(index_tts={"config": "checkpoints/config.yaml", **index_tts}),
+        ASR=ASRConfig(),
+        VAD=VADConfig(),
+        LLM=LLMConfig(max_tokens=64),
+    )
+
+
+def make_tts(**index_tts: str) -> tuple[IndexTTS, FakeIndexTTSModel]:
+    model = FakeIndexTTSModel()
+    store = OutputStore(backend="memory")
+    tts = IndexTTS(
+        make_app_config(voice="voice.wav", **index_tts), store=store, model=model
+    )
+    return tts, model
+
+
+def test_split_sentences():
+    assert split_sentences("你好。今天天气很好！\n  ok?") == [
+        "你好。",
+        "今天天气很好！",
+        "ok?",
+    ]
+
+
+def test_voice_required():
+    with pytest.raises(ValueError):
+        IndexTTS(make_app_config(), model=FakeIndexTTSModel())
+
+
+def test_warmup_runs_once_at_init():
+    _, model = make_tts(warmup="预热")
+    assert model.calls == ["预热"]
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_per_sentence():
+    tts, model = make_tts()
+
+    chunks = [chunk async for chunk in tts.stream("你好。世界！")]
+
+    assert [rate for rate, _ in chunks] == [24000, 24000]
+    assert [len(data) for _, data in chunks] == [600, 600]
+    assert model.calls == ["你好。", "世界！"]
+
+
+@pytest.mark.asyncio
+async def test_synthesize_through_event_bus():
+    tts, _ = make_tts()
+    handler = register_tts_handler(tts)
+    assert isinstance(handler, IndexTTSHandler)
+
+    event = TTSEvent(text="你好。世界！")
+    await event_bus.publish(event)
+    unregister_tts_handler(handler)
+
+    assert event.status == "completed"
+    data: Any
+    data, rate = sf.read(io.BytesIO(tts.store.read(event.audio_path)), dtype="int16")  # type: ignore
+    assert rate == 24000
+    assert len(data) == 600
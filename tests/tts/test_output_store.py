@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+import pytest
+
+from src.yeis_talkbot.tts.output_store import OutputStore
+
+
+def test_put_and_quota_evicts_oldest_unused(tmp_path):
+    now = [0.0]
+    store = OutputStore(str(tmp_path), max_bytes=25, clock=lambda: now[0])
+
+    first = store.put("a.mp3", b"x" * 10)
+    second = store.put("b.mp3", b"x" * 10)
+    store.acquire(first)
+    third = store.put("c.mp3", b"x" * 10)
+
+    assert first in store and os.path.exists(first)
+    assert second not in store and not os.path.exists(second)
+    assert third in store
+    stats = store.stats()
+    assert stats.files == 2
+    assert stats.bytes == 20
+    assert stats.evicted == 1
+    assert stats.in_use == 1
+
+
+def test_new_file_kept_when_all_others_are_held():
+    store = OutputStore(backend="memory", max_files=1)
+
+    first = store.put("a.mp3", b"a")
+    store.acquire(first)
+    second = store.put("b.mp3", b"b")
+
+    assert store.read(first) == b"a"
+    assert store.read(second) == b"b"
+    assert store.stats().evicted == 0
+
+    store.release(first)
+    store.put("c.mp3", b"c")
+    assert first not in store and second not in store
+
+
+def test_gc_respects_age_and_references(tmp_path):
+    now = [0.0]
+    store = OutputStore(str(tmp_path), ttl=10.0, clock=lambda: now[0])
+    kept = store.put("kept.mp3", b"1")
+    expired = store.put("expired.mp3", b"2")
+    now[0] = 5.0
+    fresh = store.put("fresh.mp3", b"3")
+
+    now[0] = 12.0
+    with store.use(kept):
+        assert store.gc() == 1
+
+    assert not os.path.exists(expired)
+    assert os.path.exists(kept) and os.path.exists(fresh)
+
+    assert store.gc() == 1
+    assert not os.path.exists(kept)
+    assert store.stats().expired == 2
+
+
+def test_existing_files_are_tracked(tmp_path):
+    (tmp_path / "old.mp3").write_bytes(b"x" * 7)
+
+    store = OutputStore(str(tmp_path))
+
+    assert store.stats().files == 1
+    assert store.stats().bytes == 7
+
+
+def test_externally_removed_file_is_tolerated(tmp_path):
+    store = OutputStore(str(tmp_path), ttl=0.0)
+    path = store.put("a.mp3", b"x")
+    os.remove(path)
+
+    assert store.gc() == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_backend_async_collect():
+    now = [0.0]
+    store = OutputStore(backend="memory", ttl=1.0, clock=lambda: now[0])
+    path = store.put("a.mp3", b"abc")
+
+    assert path == "memory://a.mp3"
+    assert store.read(path) == b"abc"
+
+    now[0] = 2.0
+    assert await store.collect() == 1
+    with pytest.raises(KeyError):
+        store.read(path)
+    await store.stop()
+
+
+def test_shared_store_per_output_dir(tmp_path):
+    from src.yeis_talkbot.configs import TTSConfig
+
+    config = TTSConfig(out_path=str(tmp_path))
+    store = OutputStore.shared(config)
+
+    assert OutputStore.shared(config) is store
+    assert OutputStore.shared(TTSConfig(out_path=str(tmp_path) + "/")) is store
+    assert OutputStore.shared(TTSConfig(out_path=str(tmp_path / "other"))) is not store
+
+
+@pytest.mark.asyncio
+async def test_gc_starts_on_first_put():
+    now = [0.0]
+    store = OutputStore(
+        backend="memory", ttl=1.0, gc_interval=0.01, clock=lambda: now[0]
+    )
+    path = store.put("a.mp3", b"abc")
+
+    now[0] = 2.0
+    await asyncio.sleep(0.05)
+    assert path not in store
+    await store.stop()
@@ -0,0 +1,127 @@
+import asyncio
+from typing import Any, Dict, List
+
+import pytest
+
+from src.yeis_talkbot.configs import ConfigService
+from src.yeis_talkbot.event.bus import event_bus
+from src.yeis_talkbot.event.event import TTSEvent
+from src.yeis_talkbot.tts import (
+    TTS,
+    TTSScheduler,
+    register_tts_scheduler_handler,
+    unregister_tts_handler,
+)
+
+
+class FakeTTS(TTS):
+    """本地假后端，按固定延迟返回合成结果"""
+
+    def __init__(self, delay: float = 0.01, failures: int = 0) -> None:
+        self.delay = delay
+        self.failures = failures
+        self.calls: List[str] = []
+        self.kwargs: List[Dict[str, str]] = []
+        self.active = 0
+        self.max_active = 0
+
+    async def synthesize(self, text: str, **kwargs: str) -> Any:
+        self.calls.append(text)
+        self.kwargs.append(kwargs)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("upstream unavailable")
+        return f"{text}.mp3"
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_per_backend():
+    fast, slow = FakeTTS(), FakeTTS()
+    scheduler = TTSScheduler(
+        {"fast": fast, "slow": slow}, limits={"fast": 3, "slow": 1}
+    )
+    await scheduler.start()
+
+    futures = [scheduler.submit(str(i), backend="fast") for i in range(9)]
+    futures += [scheduler.submit(str(i), backend="slow") for i in range(3)]
+    results = await asyncio.gather(*futures)
+    await scheduler.stop()
+
+    assert results[:9] == [f"{i}.mp3" for i in range(9)]
+    assert fast.max_active == 3
+    assert slow.max_active == 1
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_runs_first():
+    tts = FakeTTS()
+    scheduler = TTSScheduler({"fake": tts}, default_limit=1)
+
+    low = scheduler.submit("low", priority=0)
+    high = scheduler.submit("high", priority=5)
+    await scheduler.start()
+    await asyncio.gather(low, high)
+    await scheduler.stop()
+
+    assert tts.calls == ["high", "low"]
+
+
+@pytest.mark.asyncio
+async def test_retry_with_backoff():
+    tts = FakeTTS(delay=0, failures=2)
+    scheduler = TTSScheduler({"fake": tts}, max_retries=2, backoff=0.001)
+    await scheduler.start()
+
+    assert await scheduler.submit("hi") == "hi.mp3"
+    assert len(tts.calls) == 3
+
+    tts.failures = 3
+    assert await scheduler.submit("again") is None
+    await scheduler.stop()
+
+
+@pytest.mark.asyncio
+async def test_scheduler_handler_on_event_bus():
+    scheduler = TTSScheduler({"fake": FakeTTS()})
+    await scheduler.start()
+    handler = register_tts_scheduler_handler(scheduler)
+
+    events = [TTSEvent(text=f"t{i}", priority=i) for i in range(4)]
+    await asyncio.gather(*(event_bus.publish(event) for event in events))
+
+    unregister_tts_handler(handler)
+    await scheduler.stop()
+    assert all(event.status == "completed" for event in events)
+    assert events[2].audio_path == "t2.mp3"
+
+
+@pytest.mark.asyncio
+async def test_scheduler_handler_applies_session_overrides(
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    service = ConfigService("configs/config.yaml")
+    service.set_overrides("s1", voice="zh-CN-YunxiNeural", rate="+20%")
+    tts = FakeTTS()
+    scheduler = TTSScheduler({"fake": tts})
+    await scheduler.start()
+    handler = register_tts_scheduler_handler(scheduler, config_service=service)
+
+    await event_bus.publish(TTSEvent(text="a", session_id="s1"))
+    await event_bus.publish(TTSEvent(text="b", session_id="s2"))
+    await event_bus.publish(TTSEvent(text="c"))
+
+    unregister_tts_handler(handler)
+    await scheduler.stop()
+    default = service.snapshot.edge_tts
+    assert tts.kwargs == [
+        {"voice": "zh-CN-YunxiNeural", "rate": "+20%", "volume": default.volume},
+        {"voice": default.voice, "rate": default.rate, "volume": default.volume},
+        {},
+    ]
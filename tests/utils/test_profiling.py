@@ -0,0 +1,149 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from src.yeis_talkbot.event.bus import EventBus
+from src.yeis_talkbot.event.event import BaseEvent, TTSEvent
+from src.yeis_talkbot.utils import Profiler, SamplingProfiler, profiler
+
+
+def busy(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_stage_is_noop_when_disabled():
+    p = Profiler()
+    assert p.stage("a") is p.stage("b")
+    with p.stage("a"):
+        pass
+    assert p.stats == {}
+
+
+def test_stage_stats_and_dump(tmp_path: Path):
+    p = Profiler()
+    p.enable(cprofile=True, track_allocations=True, sampling_interval=0.001)
+    for _ in range(3):
+        with p.stage("work", "s1"):
+            busy(0.01)
+            data = [0] * 100000
+            with p.stage("inner"):
+                pass
+    p.disable()
+
+    assert p.stats["work"].calls == 3
+    assert p.stats["work"].wall_time >= 0.03
+    assert p.stats["work"].alloc_bytes > 0
+    assert p.stats["inner"].calls == 3
+    assert "inner" not in p.profiles
+    del data
+
+    files = p.dump(str(tmp_path))
+    names = {Path(f).name for f in files}
+    assert {"stages.txt", "work.prof", "samples.folded"} <= names
+    folded = (tmp_path / "samples.folded").read_text()
+    assert "busy" in folded
+
+
+def test_session_filter_and_by_session():
+    p = Profiler()
+    p.enable(sessions={"s1"}, by_session=True)
+    with p.stage("asr", "s1"):
+        pass
+    with p.stage("asr", "s2"):
+        pass
+    p.disable()
+    assert list(p.stats) == ["s1:asr"]
+
+
+def test_sampling_profiler_collapsed_format():
+    sampler = SamplingProfiler(interval=0.001)
+    sampler.start()
+    busy(0.05)
+    sampler.stop()
+    lines = sampler.collapsed().splitlines()
+    assert sampler.samples > 0
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_bus_handlers_profiled():
+    bus = EventBus()
+
+    kept: list = []
+
+    async def handler(event: BaseEvent) -> None:
+        kept.append(bytearray(100_000))
+        await asyncio.sleep(0)
+
+    bus.subscribe(TTSEvent, handler)
+    profiler.reset()
+    profiler.enable(track_allocations=True)
+    try:
+        await bus.publish(TTSEvent(session_id="s1"))
+    finally:
+        profiler.disable()
+    stats = [s for key, s in profiler.stats.items() if key.startswith("TTSEvent:")]
+    assert stats and stats[0].alloc_bytes >= 100_000
+    profiler.reset()
+
+
+@pytest.mark.asyncio
+async def test_async_stage_does_not_profile_other_sessions():
+    p = Profiler()
+    p.enable(cprofile=True)
+    other_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def session(session_id: str) -> None:
+        with p.stage("handler", session_id, sync=False):
+            other_started.set()
+            await release.wait()
+
+    async def other() -> None:
+        await other_started.wait()
+        with p.stage("other.work", "s2"):
+            busy(0.01)
+        release.set()
+
+    await asyncio.gather(session("s1"), other())
+    p.disable()
+
+    assert "handler" not in p.profiles
+    assert p.stats["handler"].cpu_time == 0.0
+    assert p.stats["handler"].wall_time >= p.stats["other.work"].wall_time
+    assert "other.work" in p.profiles
+
+
+@pytest.mark.asyncio
+async def test_async_stage_tracks_allocations_in_handler_file():
+    p = Profiler()
+    p.enable(track_allocations=True)
+    kept: list = []
+    payload = ["x" * 10] * 100000
+    handler_started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def handler() -> None:
+        with p.stage("handler", "s1", sync=False, alloc_filename=__file__):
+            kept.append(bytearray(1_000_000))
+            handler_started.set()
+            await release.wait()
+
+    async def other_session() -> None:
+        await handler_started.wait()
+        # json 模块中的分配不属于处理器所在文件
+        kept.append(json.dumps(payload))
+        release.set()
+
+    try:
+        await asyncio.gather(handler(), other_session())
+    finally:
+        p.disable()
+
+    assert 1_000_000 <= p.stats["handler"].alloc_bytes < 1_500_000
+    assert len(kept[1]) > 1_000_000